@@ -2,6 +2,8 @@
 import streamlit as st
 import sys
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -23,17 +25,42 @@ if not config.GEMINI_API_KEY or config.GEMINI_API_KEY == "your_gemini_api_key_he
     """)
     st.stop()
 
-from src.agent.graph import run_agent
 
-# Page config
-st.set_page_config(
-    page_title="BIST Analysis Agent",
-    page_icon="📈",
-    layout="wide"
-)
+@st.cache_resource(show_spinner=False)
+def get_agent():
+    """Compile the agent graph once per process, shared by all sessions."""
+    # Imported lazily: the agent stack (LangChain, Gemini, LanceDB) is slow to load
+    from src.agent.graph import create_agent_graph
+    return create_agent_graph()
 
-# Custom CSS
-st.markdown("""
+
+@st.cache_resource(show_spinner=False)
+def get_pool() -> ThreadPoolExecutor:
+    """Worker pool so agent runs don't block the script thread."""
+    return ThreadPoolExecutor(max_workers=4)
+
+
+@st.cache_data(ttl=3600, max_entries=128, show_spinner=False)
+def _cached_run_agent(query: str, _progress: list = None) -> dict:
+    """
+    Run the agent, reusing the result for repeated identical queries.
+
+    Names of nodes that did work are appended to ``_progress`` as the
+    graph advances (underscore args are not part of the cache key).
+    """
+    from src.agent.graph import run_agent_stream
+
+    for event in run_agent_stream(query, agent=get_agent()):
+        if event["type"] == "final":
+            return event["state"]
+        if event["update"] and _progress is not None:
+            _progress.append(event["name"])
+
+
+@st.cache_data(show_spinner=False)
+def _css() -> str:
+    """Custom CSS, built once per process."""
+    return """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -78,7 +105,18 @@ st.markdown("""
         font-family: monospace;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+# Page config
+st.set_page_config(
+    page_title="BIST Analysis Agent",
+    page_icon="📈",
+    layout="wide"
+)
+
+# Custom CSS
+st.markdown(_css(), unsafe_allow_html=True)
 
 # Header
 st.markdown('<h1 class="main-header">📈 BIST Stock Analysis Agent</h1>', unsafe_allow_html=True)
@@ -98,33 +136,15 @@ with st.sidebar:
     """)
 
     st.markdown("### 🎯 Supported Tickers (10 Companies)")
-    st.markdown("**Banking:**")
-    for ticker in ["AKBNK", "GARAN"]:
-        st.markdown(f'<span class="ticker-badge">{ticker}</span>', unsafe_allow_html=True)
-
-    st.markdown("**Aviation:**")
-    for ticker in ["THYAO"]:
-        st.markdown(f'<span class="ticker-badge">{ticker}</span>', unsafe_allow_html=True)
-
-    st.markdown("**Industrial:**")
-    for ticker in ["SISE", "EREGL"]:
-        st.markdown(f'<span class="ticker-badge">{ticker}</span>', unsafe_allow_html=True)
-
-    st.markdown("**Energy:**")
-    for ticker in ["TUPRS"]:
-        st.markdown(f'<span class="ticker-badge">{ticker}</span>', unsafe_allow_html=True)
-
-    st.markdown("**Holding:**")
-    for ticker in ["KCHOL", "SAHOL"]:
-        st.markdown(f'<span class="ticker-badge">{ticker}</span>', unsafe_allow_html=True)
-
-    st.markdown("**Telecom:**")
-    for ticker in ["TCELL"]:
-        st.markdown(f'<span class="ticker-badge">{ticker}</span>', unsafe_allow_html=True)
-
-    st.markdown("**Retail:**")
-    for ticker in ["BIMAS"]:
-        st.markdown(f'<span class="ticker-badge">{ticker}</span>', unsafe_allow_html=True)
+    # Badges go out as a single HTML block, built once per session
+    if "sidebar_html" not in st.session_state:
+        st.session_state.sidebar_html = "".join(
+            f"<p><strong>{group}:</strong><br>"
+            + "".join(f'<span class="ticker-badge">{ticker}</span>' for ticker in tickers)
+            + "</p>"
+            for group, tickers in config.TICKER_GROUPS
+        )
+    st.markdown(st.session_state.sidebar_html, unsafe_allow_html=True)
 
     st.markdown("### 🔧 System Status")
     # Check if RAG is initialized
@@ -146,80 +166,15 @@ with col1:
     st.markdown('<h2 class="section-header">🔍 Query Input</h2>', unsafe_allow_html=True)
 
     # Query type selector
-    query_type = st.selectbox(
-        "Select Query Type:",
-        [
-            "Fundamental Analysis",
-            "Technical Analysis",
-            "Macroeconomic Analysis",
-            "Institutional Portfolio",
-            "Comprehensive Analysis",
-            "Sector Analysis",
-            "Comparison",
-            "Risk Analysis",
-            "Custom Query"
-        ]
-    )
+    query_type = st.selectbox("Select Query Type:", list(config.SAMPLE_QUERIES))
 
     # Sample queries based on type
-    sample_queries = {
-        "Fundamental Analysis": [
-            "THYAO hissesi icin temel analiz yap",
-            "AKBNK'nin finansal durumunu degerlendir",
-            "GARAN hissesinin temel gostergelerini analiz et",
-            "SISE sirketinin mali tablolarini incele",
-            "TUPRS'un karlilik durumu nasil?"
-        ],
-        "Technical Analysis": [
-            "THYAO icin teknik analiz yap",
-            "EREGL hissesinin teknik gorunumu nasil?",
-            "KCHOL'un fiyat trendi hakkinda bilgi ver",
-            "GARAN destek direnc seviyeleri nedir?"
-        ],
-        "Macroeconomic Analysis": [
-            "Bankacilik sektoru icin makroekonomik gorunum nasil?",
-            "Turkiye ekonomisi hisse senetlerini nasil etkiler?",
-            "Enflasyonun BIST uzerindeki etkisini degerlendir",
-            "Faiz politikasi hisseleri nasil etkiler?"
-        ],
-        "Institutional Portfolio": [
-            "THYAO icin kurumsal yatirimcilar ne dusunuyor?",
-            "Hangi araci kurumlar AKBNK'yi oneriyor?",
-            "Model portfoylerde en cok onerilen bankacilik hisseleri hangileri?",
-            "GARAN'in hedef fiyatlari nedir?"
-        ],
-        "Comprehensive Analysis": [
-            "THYAO hakkinda kapsamli yatirim arastirmasi yap",
-            "GARAN icin detayli analiz raporu hazirla",
-            "SISE hissesi yatirim yapilabilir mi? Tum acilardan degerlendir",
-            "AKBNK kapsamli degerlendirme"
-        ],
-        "Sector Analysis": [
-            "Havacilik sektorunun gorunumu nasil?",
-            "Enerji sektorundeki firsatlari degerlendir",
-            "Bankacilik sektorunu analiz et",
-            "Holding sektorunde durum nasil?"
-        ],
-        "Comparison": [
-            "AKBNK ve GARAN'i karsilastir",
-            "Holding hisseleri arasinda hangisi daha cazip?",
-            "THYAO ve PGSUS havacilik hisselerini karsilastir",
-            "KCHOL ve SAHOL karsilastirmasi"
-        ],
-        "Risk Analysis": [
-            "TUPRS yatiriminin riskleri nelerdir?",
-            "TCELL icin risk-getiri analizi yap",
-            "EREGL yatirim riskleri",
-            "SAHOL volatilite analizi"
-        ],
-        "Custom Query": []
-    }
 
     # Show sample queries
-    if query_type != "Custom Query" and sample_queries[query_type]:
+    if query_type != "Custom Query" and config.SAMPLE_QUERIES[query_type]:
         selected_sample = st.selectbox(
             "Or select a sample query:",
-            [""] + sample_queries[query_type]
+            [""] + config.SAMPLE_QUERIES[query_type]
         )
         query_input = st.text_area(
             "Enter your query (Turkish):",
@@ -237,23 +192,17 @@ with col1:
         )
 
     # Analyze button
-    analyze_button = st.button("🚀 Analyze", type="primary", use_container_width=True)
+    analyze_button = st.button(
+        "🚀 Analyze",
+        type="primary",
+        use_container_width=True,
+        disabled=st.session_state.get("future") is not None and not st.session_state.future.done()
+    )
 
     # Show expected tools for each query type
-    expected_tools = {
-        "Fundamental Analysis": ["get_stock_data", "search_documents"],
-        "Technical Analysis": ["get_stock_data", "calculate_technicals"],
-        "Macroeconomic Analysis": ["get_macro_data", "search_documents"],
-        "Institutional Portfolio": ["get_model_portfolios", "get_stock_data"],
-        "Comprehensive Analysis": ["get_stock_data", "calculate_technicals", "get_macro_data", "get_model_portfolios", "search_documents"],
-        "Sector Analysis": ["get_macro_data", "search_documents", "get_stock_data"],
-        "Comparison": ["get_stock_data", "get_model_portfolios"],
-        "Risk Analysis": ["get_stock_data", "search_documents", "get_macro_data"]
-    }
-
-    if query_type in expected_tools:
+    if query_type in config.EXPECTED_TOOLS:
         st.markdown("**Expected Tools:**")
-        for tool in expected_tools[query_type]:
+        for tool in config.EXPECTED_TOOLS[query_type]:
             st.markdown(f'<span class="tool-badge">{tool}</span>', unsafe_allow_html=True)
 
 with col2:
@@ -262,21 +211,36 @@ with col2:
     # Initialize session state
     if 'result' not in st.session_state:
         st.session_state.result = None
+    if 'future' not in st.session_state:
+        st.session_state.future = None
 
     if analyze_button:
         if not query_input.strip():
             st.error("❌ Please enter a query!")
+        elif st.session_state.future is None:
+            # Run agent in the background; the page keeps rendering meanwhile
+            st.session_state.progress = []
+            st.session_state.future = get_pool().submit(
+                _cached_run_agent, query_input, _progress=st.session_state.progress
+            )
+
+    future = st.session_state.future
+    if future is not None:
+        if future.done():
+            st.session_state.future = None
+            try:
+                st.session_state.result = future.result()
+                # Encode the download payload once, not on every rerun
+                report = st.session_state.result.get('final_report', 'No report generated.')
+                st.session_state.report_bytes = report.encode("utf-8")
+            except Exception as e:
+                st.error(f"❌ Error: {str(e)}")
+                st.exception(e)
+                st.session_state.result = None
         else:
-            with st.spinner("🔄 Analyzing... This may take 10-30 seconds..."):
-                try:
-                    # Run agent
-                    result = run_agent(query_input, verbose=False)
-                    st.session_state.result = result
-                    st.rerun()
-                except Exception as e:
-                    st.error(f"❌ Error: {str(e)}")
-                    st.exception(e)
-                    st.session_state.result = None
+            with st.status("🔄 Analyzing... This may take 10-30 seconds...", expanded=True):
+                for step in st.session_state.progress:
+                    st.write(f"✅ `{step}`")
 
     # Display results
     if st.session_state.result:
@@ -317,7 +281,7 @@ with col2:
         # Download button
         st.download_button(
             label="💾 Download Report",
-            data=report,
+            data=st.session_state.report_bytes,
             file_name=f"bist_analysis_{result.get('extracted_ticker', 'general')}.txt",
             mime="text/plain"
         )
@@ -363,3 +327,8 @@ st.markdown(
     '</div>',
     unsafe_allow_html=True
 )
+
+# Poll the background agent run until it finishes
+if st.session_state.future is not None:
+    time.sleep(0.5)
+    st.rerun()
@@ -1,5 +1,8 @@
 """Configuration for BIST Analysis Agent."""
+from __future__ import annotations
+
 import os
+import re
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -13,8 +16,19 @@ WANDB_PROJECT = os.getenv("WANDB_PROJECT", "bist-analysis-agent")
 
 # === Model Configuration ===
 GEMINI_MODEL = "gemini-2.0-flash"  # Use the latest model as user requested
-EMBEDDING_MODEL = "models/text-embedding-004"
-EMBEDDING_DIMENSION = 768
+# "gemini" embeds through the API; "local" runs a multilingual sentence-transformers
+# encoder on CPU (no API calls). Documents and queries must share a backend, and
+# switching requires re-running setup_data.py.
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "gemini")
+if EMBEDDING_BACKEND == "local":
+    EMBEDDING_MODEL = "intfloat/multilingual-e5-small"
+    EMBEDDING_DIMENSION = 384
+else:
+    EMBEDDING_MODEL = "models/text-embedding-004"
+    EMBEDDING_DIMENSION = 768
+# Stored vector dtype; float16 halves the bytes scanned per search ("float32" for full precision)
+VECTOR_DTYPE = os.getenv("VECTOR_DTYPE", "float16")
+GEMINI_RPM = int(os.getenv("GEMINI_RPM", "60"))  # Client-side requests-per-minute cap
 
 # === Paths ===
 BASE_DIR = Path(__file__).parent
@@ -23,16 +37,33 @@ DOCUMENTS_DIR = DATA_DIR / "documents"
 EMBEDDINGS_DIR = DATA_DIR / "embeddings"
 EVALUATION_DIR = DATA_DIR / "evaluation"
 RESULTS_DIR = BASE_DIR / "results"
+CACHE_DIR = DATA_DIR / "cache"
+QUERY_EMBEDDING_CACHE = CACHE_DIR / "query_embeddings"  # shelve file prefix
+TICKER_CACHE_TTL = int(os.getenv("TICKER_CACHE_TTL", "3600"))  # Seconds a cached borsapy snapshot stays fresh
+TECHNICALS_CACHE_TTL = int(os.getenv("TECHNICALS_CACHE_TTL", "300"))  # Seconds calculate_technicals results are reused
+
+_dirs_ready = False
 
-# Create directories
-for dir_path in [DOCUMENTS_DIR, EMBEDDINGS_DIR, EVALUATION_DIR, RESULTS_DIR]:
-    dir_path.mkdir(parents=True, exist_ok=True)
+
+def ensure_dirs():
+    """Create the data/results directories (once per process, on first use)."""
+    global _dirs_ready
+    if _dirs_ready:
+        return
+    for dir_path in (DOCUMENTS_DIR, EMBEDDINGS_DIR, EVALUATION_DIR, RESULTS_DIR, CACHE_DIR):
+        dir_path.mkdir(parents=True, exist_ok=True)
+    _dirs_ready = True
 
 # === RAG Configuration ===
 CHUNK_SIZE = 500
 CHUNK_OVERLAP = 50
 TOP_K_RETRIEVAL = 5
+VECTOR_INDEX_MIN_ROWS = 5000  # Build an ANN index only above this many chunks
+# "IVF_PQ" (compact, quantized) or "IVF_HNSW_SQ" (graph per partition, higher recall);
+# other values are reported and the store is left unindexed (exact scan)
+VECTOR_INDEX_TYPE = os.getenv("VECTOR_INDEX_TYPE", "IVF_PQ")
 RERANK_TOP_K = 3
+RERANK_CANDIDATES_FACTOR = 4  # Candidates fetched per kept result when reranking
 
 # === Agent Configuration ===
 MAX_AGENT_STEPS = 10
@@ -40,10 +71,93 @@ TEMPERATURE = 0.1
 
 # === Evaluation Configuration ===
 NUM_ABLATION_RUNS = 3
+ABLATION_WORKERS = int(os.getenv("ABLATION_WORKERS", "16"))  # Concurrent agent runs in the sweep
 TEST_QUERIES_COUNT = 25
 
 # === Target Companies for Analysis ===
-TARGET_TICKERS = ["THYAO", "AKBNK", "GARAN", "SISE", "TUPRS", "EREGL", "KCHOL", "SAHOL", "TCELL", "BIMAS"]
+TARGET_TICKERS_ORDERED: tuple[str, ...] = ("THYAO", "AKBNK", "GARAN", "SISE", "TUPRS", "EREGL", "KCHOL", "SAHOL", "TCELL", "BIMAS")
+TARGET_TICKERS: frozenset[str] = frozenset(TARGET_TICKERS_ORDERED)  # For membership checks
+# Matches any target ticker in an upper-cased query. No word boundaries:
+# Turkish suffixes are often attached directly ("THYAOnun").
+TICKER_REGEX = re.compile("|".join(sorted(TARGET_TICKERS_ORDERED, key=len, reverse=True)))
+
+# === UI Query Examples ===
+# Sidebar grouping of the supported tickers
+TICKER_GROUPS = (
+    ("Banking", ("AKBNK", "GARAN")),
+    ("Aviation", ("THYAO",)),
+    ("Industrial", ("SISE", "EREGL")),
+    ("Energy", ("TUPRS",)),
+    ("Holding", ("KCHOL", "SAHOL")),
+    ("Telecom", ("TCELL",)),
+    ("Retail", ("BIMAS",)),
+)
+
+# Sample queries per query type (shown in the UI)
+SAMPLE_QUERIES = {
+    "Fundamental Analysis": [
+        "THYAO hissesi icin temel analiz yap",
+        "AKBNK'nin finansal durumunu degerlendir",
+        "GARAN hissesinin temel gostergelerini analiz et",
+        "SISE sirketinin mali tablolarini incele",
+        "TUPRS'un karlilik durumu nasil?"
+    ],
+    "Technical Analysis": [
+        "THYAO icin teknik analiz yap",
+        "EREGL hissesinin teknik gorunumu nasil?",
+        "KCHOL'un fiyat trendi hakkinda bilgi ver",
+        "GARAN destek direnc seviyeleri nedir?"
+    ],
+    "Macroeconomic Analysis": [
+        "Bankacilik sektoru icin makroekonomik gorunum nasil?",
+        "Turkiye ekonomisi hisse senetlerini nasil etkiler?",
+        "Enflasyonun BIST uzerindeki etkisini degerlendir",
+        "Faiz politikasi hisseleri nasil etkiler?"
+    ],
+    "Institutional Portfolio": [
+        "THYAO icin kurumsal yatirimcilar ne dusunuyor?",
+        "Hangi araci kurumlar AKBNK'yi oneriyor?",
+        "Model portfoylerde en cok onerilen bankacilik hisseleri hangileri?",
+        "GARAN'in hedef fiyatlari nedir?"
+    ],
+    "Comprehensive Analysis": [
+        "THYAO hakkinda kapsamli yatirim arastirmasi yap",
+        "GARAN icin detayli analiz raporu hazirla",
+        "SISE hissesi yatirim yapilabilir mi? Tum acilardan degerlendir",
+        "AKBNK kapsamli degerlendirme"
+    ],
+    "Sector Analysis": [
+        "Havacilik sektorunun gorunumu nasil?",
+        "Enerji sektorundeki firsatlari degerlendir",
+        "Bankacilik sektorunu analiz et",
+        "Holding sektorunde durum nasil?"
+    ],
+    "Comparison": [
+        "AKBNK ve GARAN'i karsilastir",
+        "Holding hisseleri arasinda hangisi daha cazip?",
+        "THYAO ve PGSUS havacilik hisselerini karsilastir",
+        "KCHOL ve SAHOL karsilastirmasi"
+    ],
+    "Risk Analysis": [
+        "TUPRS yatiriminin riskleri nelerdir?",
+        "TCELL icin risk-getiri analizi yap",
+        "EREGL yatirim riskleri",
+        "SAHOL volatilite analizi"
+    ],
+    "Custom Query": []
+}
+
+# Tools the agent is expected to call per UI query type
+EXPECTED_TOOLS = {
+    "Fundamental Analysis": ["get_stock_data", "search_documents"],
+    "Technical Analysis": ["get_stock_data", "calculate_technicals"],
+    "Macroeconomic Analysis": ["get_macro_data", "search_documents"],
+    "Institutional Portfolio": ["get_model_portfolios", "get_stock_data"],
+    "Comprehensive Analysis": ["get_stock_data", "calculate_technicals", "get_macro_data", "get_model_portfolios", "search_documents"],
+    "Sector Analysis": ["get_macro_data", "search_documents", "get_stock_data"],
+    "Comparison": ["get_stock_data", "get_model_portfolios"],
+    "Risk Analysis": ["get_stock_data", "search_documents", "get_macro_data"]
+}
 
 # === Model Portfolio Data (Pre-collected) ===
 MODEL_PORTFOLIOS = {
@@ -16,6 +16,8 @@ def main():
 
     args = parser.parse_args()
 
+    # Heavy imports stay inside each branch so --help returns immediately
+
     if args.setup:
         from scripts.setup_data import main as setup_main
         setup_main()
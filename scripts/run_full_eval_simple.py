@@ -10,7 +10,7 @@ print("="*80)
 print("BIST ANALYSIS AGENT - FULL EVALUATION")
 print("="*80)
 print(f"\nConfiguration: 7 configs × 3 runs × 25 queries = 525 total executions")
-print(f"Estimated time: 30-60 minutes")
+print(f"Concurrent workers: {config.ABLATION_WORKERS}")
 print(f"Results will be saved to: results/ablation_results_[timestamp].json\n")
 
 # Run without W&B to avoid hanging
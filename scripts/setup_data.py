@@ -1,40 +1,47 @@
 """Setup script to generate and index financial documents."""
 import sys
 import os
+from itertools import islice
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import config
 from src.rag.document_generator import generate_financial_documents
-from src.rag.chunking import chunk_documents
+from src.rag.chunking import iter_chunks
 from src.rag.embeddings import embed_texts
 from src.rag.vector_store import VectorStore
 from src.tools.rag_search import init_rag_search
 
+# Chunks embedded and written per step: 8 embedding requests of 100, which
+# get_embeddings sends concurrently
+CHUNK_BATCH_SIZE = 800
+
+
+def embedded_batches(documents: list):
+    """Chunk documents lazily and yield (chunks, embeddings) per batch."""
+    chunks = iter_chunks(documents)
+    while batch := list(islice(chunks, CHUNK_BATCH_SIZE)):
+        embeddings = embed_texts([c["text"] for c in batch], is_query=False)
+        yield batch, embeddings
+
 
 def main():
     print("="*50)
     print("BIST Analysis Agent - Data Setup")
     print("="*50)
 
+    config.ensure_dirs()
+
     # Step 1: Generate documents from API data
-    print("\n[1/4] Generating financial documents...")
+    print("\n[1/2] Generating financial documents...")
     documents = generate_financial_documents()
 
-    # Step 2: Chunk documents
-    print("\n[2/4] Chunking documents...")
-    chunks = chunk_documents(documents)
-
-    # Step 3: Generate embeddings
-    print("\n[3/4] Generating embeddings...")
-    texts = [c["text"] for c in chunks]
-    embeddings = embed_texts(texts, is_query=False)
-    print(f"Generated {len(embeddings)} embeddings")
-
-    # Step 4: Index in vector store
-    print("\n[4/4] Indexing in LanceDB...")
+    # Step 2: Chunk, embed and index batch by batch, so only one batch of
+    # chunks and vectors is in memory at a time
+    print("\n[2/2] Chunking, embedding and indexing in LanceDB...")
     vector_store = VectorStore()
-    vector_store.create_index(chunks, embeddings)
+    vector_store.create_index_batches(embedded_batches(documents))
 
     # Initialize RAG search tool
     init_rag_search(vector_store)
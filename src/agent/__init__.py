@@ -1,10 +1,11 @@
-from .graph import create_agent_graph, run_agent
+from .graph import create_agent_graph, run_agent, run_agent_stream
 from .state import AgentState
 from .prompts import SYSTEM_PROMPT, PLANNING_PROMPT
 
 __all__ = [
     "create_agent_graph",
     "run_agent",
+    "run_agent_stream",
     "AgentState",
     "SYSTEM_PROMPT",
     "PLANNING_PROMPT",
@@ -1,4 +1,6 @@
 """LangGraph agent definition."""
+from typing import Iterator, Optional
+from functools import lru_cache
 from langgraph.graph import StateGraph, END
 from .state import AgentState
 from .nodes import (
@@ -12,6 +14,15 @@ from .nodes import (
     synthesize_report
 )
 
+# Data-gathering nodes have no dependency on each other
+GATHER_NODES = (
+    "gather_stock_data",
+    "gather_macro_data",
+    "gather_technical_data",
+    "gather_portfolio_data",
+    "retrieve_documents",
+)
+
 
 def create_agent_graph() -> StateGraph:
     """Create the BIST analysis agent graph."""
@@ -33,36 +44,36 @@ def create_agent_graph() -> StateGraph:
     workflow.set_entry_point("parse_query")
     workflow.add_edge("parse_query", "create_plan")
 
-    # After planning, gather all data (can be parallelized in future)
-    workflow.add_edge("create_plan", "gather_stock_data")
-    workflow.add_edge("gather_stock_data", "gather_macro_data")
-    workflow.add_edge("gather_macro_data", "gather_technical_data")
-    workflow.add_edge("gather_technical_data", "gather_portfolio_data")
-    workflow.add_edge("gather_portfolio_data", "retrieve_documents")
-    workflow.add_edge("retrieve_documents", "synthesize_report")
+    # After planning, gather all data in parallel branches
+    for node in GATHER_NODES:
+        workflow.add_edge("create_plan", node)
+
+    # Synthesis waits for every branch to finish
+    workflow.add_edge(list(GATHER_NODES), "synthesize_report")
     workflow.add_edge("synthesize_report", END)
 
     return workflow.compile()
 
 
-def run_agent(query: str, verbose: bool = False) -> dict:
-    """
-    Run the BIST analysis agent.
-
-    Args:
-        query: User query
-        verbose: Print progress
+@lru_cache(maxsize=1)
+def _default_agent():
+    """Compile the graph once and share it across run_agent calls."""
+    return create_agent_graph()
 
-    Returns:
-        Final state with analysis report
-    """
-    agent = create_agent_graph()
 
-    # Initial state
-    initial_state = {
+def _initial_state(
+    query: str,
+    disabled_tools: int = 0,
+    model: Optional[str] = None,
+    temperature: Optional[float] = None
+) -> dict:
+    """Build the initial agent state for a query."""
+    return {
         "query": query,
         "extracted_ticker": None,
         "query_type": None,
+        "model": model,
+        "temperature": temperature,
         "plan": None,
         "stock_data": None,
         "macro_data": None,
@@ -73,18 +84,79 @@ def run_agent(query: str, verbose: bool = False) -> dict:
         "messages": [],
         "final_report": None,
         "tools_called": [],
+        "tools_mask": 0,
+        "disabled_tools": disabled_tools,
         "step_count": 0,
         "errors": []
     }
 
+
+def run_agent(
+    query: str,
+    verbose: bool = False,
+    agent=None,
+    disabled_tools: int = 0,
+    model: Optional[str] = None,
+    temperature: Optional[float] = None
+) -> dict:
+    """
+    Run the BIST analysis agent.
+
+    Args:
+        query: User query
+        verbose: Print progress
+        agent: Optional pre-compiled graph (defaults to a shared compiled graph)
+        disabled_tools: Tools bitmask of tools the plan must not execute
+        model: Gemini model for the report (defaults to config.GEMINI_MODEL)
+        temperature: Sampling temperature for the report (defaults to config.TEMPERATURE)
+
+    Returns:
+        Final state with analysis report
+    """
+    if agent is None:
+        agent = _default_agent()
+
     if verbose:
         print(f"Starting analysis for: {query}")
 
     # Run agent
-    final_state = agent.invoke(initial_state)
+    final_state = agent.invoke(_initial_state(query, disabled_tools, model, temperature))
 
     if verbose:
         print(f"Completed in {final_state['step_count']} steps")
         print(f"Tools used: {final_state['tools_called']}")
 
     return final_state
+
+
+def run_agent_stream(
+    query: str,
+    agent=None,
+    model: Optional[str] = None,
+    temperature: Optional[float] = None
+) -> Iterator[dict]:
+    """
+    Run the BIST analysis agent, yielding progress as each node finishes.
+
+    Args:
+        query: User query
+        agent: Optional pre-compiled graph (defaults to a shared compiled graph)
+        model: Gemini model for the report (defaults to config.GEMINI_MODEL)
+        temperature: Sampling temperature for the report (defaults to config.TEMPERATURE)
+
+    Yields:
+        {"type": "step", "name": node, "update": state delta} per node,
+        then {"type": "final", "state": final state}
+    """
+    if agent is None:
+        agent = _default_agent()
+
+    final_state = None
+    for mode, chunk in agent.stream(_initial_state(query, model=model, temperature=temperature), stream_mode=["updates", "values"]):
+        if mode == "updates":
+            for name, update in chunk.items():
+                yield {"type": "step", "name": name, "update": update or {}}
+        else:
+            final_state = chunk
+
+    yield {"type": "final", "state": final_state}
@@ -1,63 +1,103 @@
 """Agent graph nodes."""
 from typing import Dict, Any
-from langchain_google_genai import ChatGoogleGenerativeAI
+from enum import IntFlag
+from functools import lru_cache, reduce
+import operator
+import json
+import re
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-import sys
-import os
 
-# Add parent directory to path for config import
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import config
 
+from src.utils.llm import get_llm
+from src.utils.rate_limit import gemini_call
 from .state import AgentState
 from .prompts import SYSTEM_PROMPT, PLANNING_PROMPT, SYNTHESIS_PROMPT
 
 
-# Initialize LLM
-llm = ChatGoogleGenerativeAI(
-    model=config.GEMINI_MODEL,
-    google_api_key=config.GEMINI_API_KEY,
-    temperature=config.TEMPERATURE
+# Query-type keywords, highest priority first
+QUERY_TYPE_KEYWORDS = (
+    ("fundamental", ("temel", "fundamental", "finansal", "bilanco", "gelir")),
+    ("technical", ("teknik", "rsi", "trend", "grafik", "fiyat hareketi")),
+    ("macro", ("makro", "ekonomi", "faiz", "enflasyon", "tcmb")),
+    ("portfolio", ("model portfoy", "kurumsal", "analist", "hedef fiyat")),
+    ("comprehensive", ("kapsamli", "detayli", "tum", "genel")),
+    ("comparison", ("karsilastir", "kiyasla", "vs", "ile")),
+    ("sector", ("sektor", "havacilik", "bankacilik", "enerji")),
 )
+_QUERY_TYPE_PRIORITY = {name: i for i, (name, _) in enumerate(QUERY_TYPE_KEYWORDS)}
+# One named group per type inside a lookahead, so a single scan reports
+# every keyword occurrence, overlapping ones included
+_QUERY_TYPE_RE = re.compile("(?=" + "|".join(
+    f"(?P<{name}>{'|'.join(map(re.escape, words))})" for name, words in QUERY_TYPE_KEYWORDS
+) + ")")
+
+
+class Tools(IntFlag):
+    """Bit per data-gathering tool, so plan membership is a single AND."""
+    STOCK = 1
+    MACRO = 2
+    TECHNICALS = 4
+    PORTFOLIOS = 8
+    DOCUMENTS = 16
+
+
+TOOL_FLAGS = {
+    "get_stock_data": Tools.STOCK,
+    "get_macro_data": Tools.MACRO,
+    "calculate_technicals": Tools.TECHNICALS,
+    "get_model_portfolios": Tools.PORTFOLIOS,
+    "search_documents": Tools.DOCUMENTS,
+}
+
+# Tools to use per query type, in plan order
+TOOLS_BY_QUERY_TYPE = {
+    "fundamental": ["get_stock_data", "search_documents"],
+    "technical": ["get_stock_data", "calculate_technicals"],
+    "macro": ["get_macro_data", "search_documents"],
+    "portfolio": ["get_model_portfolios", "get_stock_data"],
+    "comprehensive": ["get_stock_data", "calculate_technicals", "get_macro_data", "get_model_portfolios", "search_documents"],
+    "comparison": ["get_stock_data", "get_model_portfolios"],
+    "sector": ["get_macro_data", "search_documents", "get_stock_data"],
+    "general": ["get_macro_data", "search_documents"]
+}
+_DEFAULT_TOOLS = ["search_documents"]
+
+
+def _tools_mask(tool_names) -> Tools:
+    """Combine tool names into one Tools bitmask."""
+    return reduce(operator.or_, (TOOL_FLAGS[name] for name in tool_names), Tools(0))
+
+
+_TOOLS_MASK_BY_QUERY_TYPE = {qt: _tools_mask(names) for qt, names in TOOLS_BY_QUERY_TYPE.items()}
+
+
+@lru_cache(maxsize=1)
+def _get_retriever():
+    """Return a shared retriever so the LanceDB connection is opened once."""
+    from src.rag.retrieval import RAGRetriever
+    return RAGRetriever()
 
 
 def parse_query(state: AgentState) -> AgentState:
     """Parse user query to extract intent and ticker."""
     query = state["query"]
 
-    # Simple ticker extraction
-    ticker = None
-    query_upper = query.upper()
-
-    for t in config.TARGET_TICKERS:
-        if t in query_upper:
-            ticker = t
-            break
-
-    # Determine query type
-    query_lower = query.lower()
-    if any(w in query_lower for w in ["temel", "fundamental", "finansal", "bilanco", "gelir"]):
-        query_type = "fundamental"
-    elif any(w in query_lower for w in ["teknik", "rsi", "trend", "grafik", "fiyat hareketi"]):
-        query_type = "technical"
-    elif any(w in query_lower for w in ["makro", "ekonomi", "faiz", "enflasyon", "tcmb"]):
-        query_type = "macro"
-    elif any(w in query_lower for w in ["model portfoy", "kurumsal", "analist", "hedef fiyat"]):
-        query_type = "portfolio"
-    elif any(w in query_lower for w in ["kapsamli", "detayli", "tum", "genel"]):
-        query_type = "comprehensive"
-    elif any(w in query_lower for w in ["karsilastir", "kiyasla", "vs", "ile"]):
-        query_type = "comparison"
-    elif any(w in query_lower for w in ["sektor", "havacilik", "bankacilik", "enerji"]):
-        query_type = "sector"
+    # Simple ticker extraction: one regex scan, first match in ticker list order
+    mentioned = set(config.TICKER_REGEX.findall(query.upper()))
+    ticker = next((t for t in config.TARGET_TICKERS_ORDERED if t in mentioned), None)
+
+    # Determine query type: highest-priority type with a keyword in the query
+    matched = {m.lastgroup for m in _QUERY_TYPE_RE.finditer(query.lower())}
+    if matched:
+        query_type = min(matched, key=_QUERY_TYPE_PRIORITY.__getitem__)
     else:
         query_type = "comprehensive" if ticker else "general"
 
     return {
-        **state,
         "extracted_ticker": ticker,
         "query_type": query_type,
-        "step_count": state.get("step_count", 0) + 1
+        "step_count": 1
     }
 
 
@@ -67,18 +107,11 @@ def create_plan(state: AgentState) -> AgentState:
     ticker = state.get("extracted_ticker")
 
     # Determine which tools to use based on query type
-    tools_map = {
-        "fundamental": ["get_stock_data", "search_documents"],
-        "technical": ["get_stock_data", "calculate_technicals"],
-        "macro": ["get_macro_data", "search_documents"],
-        "portfolio": ["get_model_portfolios", "get_stock_data"],
-        "comprehensive": ["get_stock_data", "calculate_technicals", "get_macro_data", "get_model_portfolios", "search_documents"],
-        "comparison": ["get_stock_data", "get_model_portfolios"],
-        "sector": ["get_macro_data", "search_documents", "get_stock_data"],
-        "general": ["get_macro_data", "search_documents"]
-    }
-
-    tools_needed = tools_map.get(query_type, ["search_documents"])
+    tools_needed = TOOLS_BY_QUERY_TYPE.get(query_type, _DEFAULT_TOOLS)
+    tools_mask = _TOOLS_MASK_BY_QUERY_TYPE.get(query_type, Tools.DOCUMENTS)
+    # Ablated tools stay in the plan (tool selection is still scored) but
+    # their gather nodes are skipped
+    tools_mask &= ~Tools(state.get("disabled_tools", 0))
 
     plan = f"""
 Analiz Plani:
@@ -88,70 +121,67 @@ Analiz Plani:
 """
 
     return {
-        **state,
         "plan": plan,
         "tools_called": tools_needed,
-        "step_count": state.get("step_count", 0) + 1
+        "tools_mask": int(tools_mask),
+        "step_count": 1
     }
 
 
 def gather_stock_data(state: AgentState) -> AgentState:
     """Gather stock data if needed."""
-    if "get_stock_data" not in state.get("tools_called", []):
-        return state
+    if not state.get("tools_mask", 0) & Tools.STOCK:
+        return {}
 
     ticker = state.get("extracted_ticker")
     if not ticker:
-        return {**state, "stock_data": None}
+        return {"stock_data": None}
 
     from src.tools.market_data import get_stock_data
     data = get_stock_data(ticker)
 
     return {
-        **state,
         "stock_data": data,
-        "step_count": state.get("step_count", 0) + 1
+        "step_count": 1
     }
 
 
 def gather_macro_data(state: AgentState) -> AgentState:
     """Gather macroeconomic data if needed."""
-    if "get_macro_data" not in state.get("tools_called", []):
-        return state
+    if not state.get("tools_mask", 0) & Tools.MACRO:
+        return {}
 
     from src.tools.macro_data import get_macro_data
     data = get_macro_data()
 
     return {
-        **state,
         "macro_data": data,
-        "step_count": state.get("step_count", 0) + 1
+        "step_count": 1
     }
 
 
 def gather_technical_data(state: AgentState) -> AgentState:
     """Gather technical analysis data if needed."""
-    if "calculate_technicals" not in state.get("tools_called", []):
-        return state
+    if not state.get("tools_mask", 0) & Tools.TECHNICALS:
+        return {}
 
     ticker = state.get("extracted_ticker")
     if not ticker:
-        return {**state, "technical_data": None}
+        return {"technical_data": None}
 
     from src.tools.technicals import calculate_technicals
     data = calculate_technicals(ticker)
 
     return {
-        **state,
         "technical_data": data,
-        "step_count": state.get("step_count", 0) + 1
+        "step_count": 1
     }
 
 
 def gather_portfolio_data(state: AgentState) -> AgentState:
     """Gather model portfolio data if needed."""
-    if "get_model_portfolios" not in state.get("tools_called", []):
-        return state
+    if not state.get("tools_mask", 0) & Tools.PORTFOLIOS:
+        return {}
 
     ticker = state.get("extracted_ticker")
 
@@ -159,21 +189,18 @@ def gather_portfolio_data(state: AgentState) -> AgentState:
     data = get_model_portfolios(ticker)
 
     return {
-        **state,
         "portfolio_data": data,
-        "step_count": state.get("step_count", 0) + 1
+        "step_count": 1
     }
 
 
 def retrieve_documents(state: AgentState) -> AgentState:
     """Retrieve relevant documents via RAG."""
-    if "search_documents" not in state.get("tools_called", []):
-        return state
-
-    from src.rag.retrieval import RAGRetriever
+    if not state.get("tools_mask", 0) & Tools.DOCUMENTS:
+        return {}
 
     try:
-        retriever = RAGRetriever()
+        retriever = _get_retriever()
         result = retriever.retrieve_with_context(
             query=state["query"],
             ticker=state.get("extracted_ticker"),
@@ -181,18 +208,16 @@ def retrieve_documents(state: AgentState) -> AgentState:
         )
 
         return {
-            **state,
             "rag_context": result["context"],
             "rag_sources": result["sources"],
-            "step_count": state.get("step_count", 0) + 1
+            "step_count": 1
         }
     except Exception as e:
         return {
-            **state,
             "rag_context": f"Dokuman aramasi basarisiz: {str(e)}",
             "rag_sources": [],
-            "errors": state.get("errors", []) + [str(e)],
-            "step_count": state.get("step_count", 0) + 1
+            "errors": [str(e)],
+            "step_count": 1
         }
 
 
@@ -221,31 +246,22 @@ def synthesize_report(state: AgentState) -> AgentState:
         HumanMessage(content=synthesis_input)
     ]
 
-    response = llm.invoke(messages)
+    llm = get_llm(
+        state.get("model") or config.GEMINI_MODEL,
+        config.TEMPERATURE if state.get("temperature") is None else state["temperature"]
+    )
+    response = gemini_call(llm.invoke, messages)
 
     return {
-        **state,
         "final_report": response.content,
-        "messages": state.get("messages", []) + [AIMessage(content=response.content)],
-        "step_count": state.get("step_count", 0) + 1
+        "messages": [AIMessage(content=response.content)],
+        "step_count": 1
     }
 
 
-def _format_dict(d: dict, indent: int = 0) -> str:
-    """Format dictionary as readable string."""
+def _format_dict(d: dict) -> str:
+    """Format dictionary as readable string (indented JSON, Turkish text kept as-is)."""
     if d is None:
         return "None"
 
-    lines = []
-    prefix = "  " * indent
-
-    for key, value in d.items():
-        if isinstance(value, dict):
-            lines.append(f"{prefix}{key}:")
-            lines.append(_format_dict(value, indent + 1))
-        elif isinstance(value, list):
-            lines.append(f"{prefix}{key}: {value}")
-        else:
-            lines.append(f"{prefix}{key}: {value}")
-
-    return "\n".join(lines)
+    return json.dumps(d, indent=2, ensure_ascii=False, default=str)
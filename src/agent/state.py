@@ -1,4 +1,5 @@
 """Agent state definition."""
+import operator
 from typing import TypedDict, List, Optional, Annotated
 from langgraph.graph import add_messages
 
@@ -11,6 +12,10 @@ class AgentState(TypedDict):
     extracted_ticker: Optional[str]
     query_type: Optional[str]
 
+    # LLM settings for synthesis (None means the config default)
+    model: Optional[str]
+    temperature: Optional[float]
+
     # Planning
     plan: Optional[str]
 
@@ -28,7 +33,9 @@ class AgentState(TypedDict):
     # Output
     final_report: Optional[str]
 
-    # Metadata for evaluation
+    # Metadata for evaluation (summed across parallel gather branches)
     tools_called: List[str]
-    step_count: int
-    errors: List[str]
+    tools_mask: int  # Tools bitmask of tools_called, checked by the gather nodes
+    disabled_tools: int  # Tools bitmask never executed (ablation configs)
+    step_count: Annotated[int, operator.add]
+    errors: Annotated[List[str], operator.add]
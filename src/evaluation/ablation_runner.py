@@ -1,16 +1,21 @@
 """Ablation study runner."""
 from typing import List, Dict
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import json
 from datetime import datetime
 from pathlib import Path
-import sys
-import os
 
-# Add parent directory to path for config import
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import config
 
 import wandb
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from .ragas_metrics import RAGASEvaluator
 from .llm_judge import LLMJudge
 from .tool_metrics import ToolMetrics
@@ -64,6 +69,11 @@ class AblationRunner:
         }
     }
 
+    RAGAS_METRICS = ("faithfulness", "answer_relevancy", "context_precision")
+    JUDGE_DIMENSIONS = ("data_accuracy", "analysis_depth", "reasoning_quality",
+                        "investor_usefulness", "presentation_quality")
+    TOOL_METRICS = ("tool_precision", "tool_recall", "tool_f1", "tool_output_validity")
+
     def __init__(self, use_wandb: bool = True):
         self.ragas_eval = RAGASEvaluator()
         self.judge = LLMJudge()
@@ -92,44 +102,77 @@ class AblationRunner:
         Returns:
             Results for all configurations
         """
+        # Embed all test queries in one request; retrieval then reads them
+        # from the query embedding cache instead of calling the API
+        from src.rag.embeddings import prefetch_query_embeddings
+        prefetch_query_embeddings([q["query"] for q in test_queries])
+
+        # Every (config, run, query) execution is independent and waits on
+        # the LLM API, so they all share one thread pool. Gemini calls still
+        # go through the shared client-side rate limiter.
+        tasks = [
+            (config_name, config_params, run_idx, query_data)
+            for config_name, config_params in self.CONFIGURATIONS.items()
+            for run_idx in range(num_runs)
+            for query_data in test_queries
+        ]
+        print(f"Dispatching {len(tasks)} executions on {config.ABLATION_WORKERS} workers")
+
+        with ThreadPoolExecutor(max_workers=config.ABLATION_WORKERS) as executor:
+            query_results = list(executor.map(lambda task: self._run_query(*task), tasks))
+
+        # map() preserves task order: consecutive slices are (config, run) groups
         all_results = {}
+        n = len(test_queries)
+        offset = 0
 
         for config_name, config_params in self.CONFIGURATIONS.items():
             print(f"\n{'='*50}")
-            print(f"Running configuration: {config_name}")
+            print(f"Configuration: {config_name}")
             print(f"Description: {config_params['description']}")
             print(f"{'='*50}")
 
             config_results = []
 
+            # One wandb run per config; each repeat is logged as a step
+            wandb_active = False
+            if self.use_wandb:
+                try:
+                    wandb.init(
+                        project=config.WANDB_PROJECT,
+                        name=config_name,
+                        config=config_params,
+                        reinit=True
+                    )
+                    wandb_active = True
+                except Exception as e:
+                    print(f"Warning: Could not init wandb: {e}")
+
             for run_idx in range(num_runs):
-                print(f"\nRun {run_idx + 1}/{num_runs}")
+                run_query_results = query_results[offset:offset + n]
+                offset += n
+
+                run_results = {
+                    "config": config_name,
+                    "query_results": run_query_results,
+                    "aggregate": self._aggregate_query_results(run_query_results)
+                }
+                config_results.append(run_results)
+
+                print(f"Run {run_idx + 1}/{num_runs}: "
+                      f"success rate {run_results['aggregate'].get('success_rate', 0):.0%}")
 
-                if self.use_wandb:
+                if wandb_active:
                     try:
-                        wandb.init(
-                            project=config.WANDB_PROJECT,
-                            name=f"{config_name}_run{run_idx + 1}",
-                            config=config_params,
-                            reinit=True
-                        )
+                        wandb.log({**run_results["aggregate"], "run_idx": run_idx + 1})
                     except Exception as e:
-                        print(f"Warning: Could not init wandb: {e}")
-
-                run_results = self._run_single_config(
-                    config_name,
-                    config_params,
-                    test_queries
-                )
+                        print(f"Warning: Could not log to wandb: {e}")
 
-                config_results.append(run_results)
-
-                if self.use_wandb:
-                    try:
-                        wandb.log(run_results["aggregate"])
-                        wandb.finish()
-                    except:
-                        pass
+            if wandb_active:
+                try:
+                    wandb.finish()
+                except Exception:
+                    pass
 
             # Aggregate across runs
             all_results[config_name] = self._aggregate_runs(config_results)
@@ -139,68 +182,61 @@ class AblationRunner:
 
         return all_results
 
-    def _run_single_config(
+    def _run_query(
         self,
         config_name: str,
         config_params: Dict,
-        test_queries: List[Dict]
+        run_idx: int,
+        query_data: Dict
     ) -> Dict:
-        """Run a single configuration on all test queries."""
+        """Run and evaluate one test query under a configuration."""
         from src.agent.graph import run_agent
+        from src.agent.nodes import Tools
+
+        query = query_data["query"]
+        expected_tools = query_data.get("expected_tools", [])
+
+        # Components the config disables are never executed, so their data
+        # stays None and no retrieval or tool calls are paid for
+        disabled = Tools(0)
+        if not config_params["use_rag"]:
+            disabled |= Tools.DOCUMENTS
+        if not config_params["use_tools"]:
+            disabled |= Tools.STOCK | Tools.MACRO | Tools.TECHNICALS | Tools.PORTFOLIOS
+
+        try:
+            # Configs may pin the report model/temperature; None keeps the config default
+            result = run_agent(
+                query,
+                verbose=False,
+                disabled_tools=int(disabled),
+                model=config_params.get("model"),
+                temperature=config_params.get("temperature")
+            )
+
+            # Evaluate
+            eval_result = self._evaluate_result(
+                query=query,
+                result=result,
+                expected_tools=expected_tools
+            )
+
+            print(f"  [{config_name} #{run_idx + 1}] {query[:50]}...")
+
+            return {
+                "query_id": query_data["id"],
+                "query": query,
+                "query_type": query_data.get("type"),
+                **eval_result
+            }
 
-        query_results = []
-
-        for query_data in test_queries:
-            query = query_data["query"]
-            expected_tools = query_data.get("expected_tools", [])
-
-            print(f"  Query: {query[:50]}...")
-
-            try:
-                # Run agent (with modified config if needed)
-                result = run_agent(query, verbose=False)
-
-                # If config disables RAG or tools, simulate that
-                if not config_params["use_rag"]:
-                    result["rag_context"] = None
-                    result["rag_sources"] = []
-
-                if not config_params["use_tools"]:
-                    result["stock_data"] = None
-                    result["macro_data"] = None
-                    result["technical_data"] = None
-                    result["portfolio_data"] = None
-
-                # Evaluate
-                eval_result = self._evaluate_result(
-                    query=query,
-                    result=result,
-                    expected_tools=expected_tools
-                )
-
-                query_results.append({
-                    "query_id": query_data["id"],
-                    "query": query,
-                    "query_type": query_data.get("type"),
-                    **eval_result
-                })
-
-            except Exception as e:
-                print(f"    Error: {e}")
-                query_results.append({
-                    "query_id": query_data["id"],
-                    "query": query,
-                    "error": str(e)
-                })
-
-        # Aggregate query results
-        aggregate = self._aggregate_query_results(query_results)
-
-        return {
-            "config": config_name,
-            "query_results": query_results,
-            "aggregate": aggregate
-        }
+        except Exception as e:
+            print(f"  [{config_name} #{run_idx + 1}] Error on {query[:50]}...: {e}")
+            return {
+                "query_id": query_data["id"],
+                "query": query,
+                "error": str(e)
+            }
 
     def _evaluate_result(
         self,
@@ -213,23 +249,28 @@ class AblationRunner:
         contexts = [result.get("rag_context", "")] if result.get("rag_context") else []
         tools_called = result.get("tools_called", [])
 
-        # RAGAS metrics
-        ragas_scores = self.ragas_eval.evaluate(
-            query=query,
-            response=response,
-            contexts=contexts
-        )
-
-        # LLM Judge scores
         rag_sources = result.get("rag_sources") or []
         sources_str = "\n".join([f"- {s}" for s in rag_sources if isinstance(s, str)])
         if not sources_str and rag_sources:
             sources_str = "\n".join([f"- {s.get('source', str(s))}" for s in rag_sources])
-        judge_scores = self.judge.evaluate(
-            query=query,
-            response=response,
-            sources=sources_str
-        )
+
+        # LLM Judge scores on a side thread while RAGAS scores here; the two
+        # are independent LLM calls
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            judge_future = executor.submit(
+                self.judge.evaluate,
+                query=query,
+                response=response,
+                sources=sources_str
+            )
+
+            # RAGAS metrics
+            ragas_scores = self.ragas_eval.evaluate(
+                query=query,
+                response=response,
+                contexts=contexts
+            )
+            judge_scores = judge_future.result()
 
         # Tool metrics
         tool_scores = self.tool_metrics.evaluate(
@@ -257,71 +298,93 @@ class AblationRunner:
         if not valid_results:
             return {"error": "All queries failed"}
 
-        # RAGAS aggregation
-        ragas_metrics = ["faithfulness", "answer_relevancy", "context_precision"]
-        ragas_agg = {}
-        for metric in ragas_metrics:
-            values = [r["ragas"].get(metric, 0) for r in valid_results if "ragas" in r]
-            if values:
-                ragas_agg[f"ragas_{metric}"] = sum(values) / len(values)
-
-        # Judge aggregation
-        judge_dims = ["data_accuracy", "analysis_depth", "reasoning_quality",
-                      "investor_usefulness", "presentation_quality"]
-        judge_agg = {}
-        for dim in judge_dims:
-            values = [r["judge"][dim]["score"] for r in valid_results
-                     if "judge" in r and dim in r["judge"]]
-            if values:
-                judge_agg[f"judge_{dim}"] = sum(values) / len(values)
-
-        if [r["judge"].get("overall_score", 0) for r in valid_results if "judge" in r]:
-            judge_agg["judge_overall"] = sum(
-                r["judge"].get("overall_score", 0) for r in valid_results if "judge" in r
-            ) / len(valid_results)
-
-        # Tool aggregation
-        tool_metrics = ["tool_precision", "tool_recall", "tool_f1", "tool_output_validity"]
-        tool_agg = {}
-        for metric in tool_metrics:
-            values = [r["tools"].get(metric, 0) for r in valid_results if "tools" in r]
-            if values:
-                tool_agg[metric] = sum(values) / len(values)
+        # One pass over the results, keeping a running [sum, count] per metric
+        totals = defaultdict(lambda: [0.0, 0])
+        total_steps = 0
+
+        for r in valid_results:
+            total_steps += r.get("step_count", 0)
+
+            if "ragas" in r:
+                for metric in self.RAGAS_METRICS:
+                    acc = totals[f"ragas_{metric}"]
+                    acc[0] += r["ragas"].get(metric, 0)
+                    acc[1] += 1
+
+            if "judge" in r:
+                judge = r["judge"]
+                for dim in self.JUDGE_DIMENSIONS:
+                    if dim in judge:
+                        acc = totals[f"judge_{dim}"]
+                        acc[0] += judge[dim]["score"]
+                        acc[1] += 1
+                totals["judge_overall"][0] += judge.get("overall_score", 0)
+
+            if "tools" in r:
+                for metric in self.TOOL_METRICS:
+                    acc = totals[metric]
+                    acc[0] += r["tools"].get(metric, 0)
+                    acc[1] += 1
+
+        # The overall judge score is averaged over every valid result
+        if "judge_overall" in totals:
+            totals["judge_overall"][1] = len(valid_results)
+
+        ordered = (
+            [f"ragas_{m}" for m in self.RAGAS_METRICS]
+            + [f"judge_{d}" for d in self.JUDGE_DIMENSIONS]
+            + ["judge_overall"]
+            + list(self.TOOL_METRICS)
+        )
 
         return {
-            **ragas_agg,
-            **judge_agg,
-            **tool_agg,
+            **{key: totals[key][0] / totals[key][1] for key in ordered if key in totals},
             "success_rate": len(valid_results) / len(query_results),
-            "avg_steps": sum(r.get("step_count", 0) for r in valid_results) / len(valid_results)
+            "avg_steps": total_steps / len(valid_results)
         }
 
     def _aggregate_runs(self, run_results: List[Dict]) -> Dict:
         """Aggregate results across runs (mean +/- std)."""
         import numpy as np
 
-        all_metrics = {}
-
-        for result in run_results:
-            agg = result.get("aggregate", {})
-            for metric, value in agg.items():
-                if isinstance(value, (int, float)):
-                    if metric not in all_metrics:
-                        all_metrics[metric] = []
-                    all_metrics[metric].append(value)
+        aggregates = [result.get("aggregate", {}) for result in run_results]
+
+        # Numeric metrics in first-seen order
+        metrics = list(dict.fromkeys(
+            metric for agg in aggregates
+            for metric, value in agg.items() if isinstance(value, (int, float))
+        ))
+        if not metrics:
+            return {}
+
+        # (runs, metrics) matrix; NaN where a run lacks a metric, so the
+        # nan-reductions only average the runs that reported it
+        values = np.array([
+            [agg[m] if isinstance(agg.get(m), (int, float)) else np.nan for m in metrics]
+            for agg in aggregates
+        ], dtype=np.float64)
+        means = np.nanmean(values, axis=0)
+        stds = np.nanstd(values, axis=0)
 
         final = {}
-        for metric, values in all_metrics.items():
-            final[f"{metric}_mean"] = np.mean(values)
-            final[f"{metric}_std"] = np.std(values)
+        for metric, mean, std in zip(metrics, means, stds):
+            final[f"{metric}_mean"] = mean
+            final[f"{metric}_std"] = std
 
         return final
 
     def _save_results(self, results: Dict):
         """Save results to file."""
+        config.ensure_dirs()
         output_path = config.RESULTS_DIR / f"ablation_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
+        if ORJSON_AVAILABLE:
+            output_path.write_bytes(orjson.dumps(
+                results,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            ))
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
 
         print(f"\nResults saved to: {output_path}")
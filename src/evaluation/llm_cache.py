@@ -0,0 +1,47 @@
+"""Content-addressed cache for evaluation LLM calls."""
+from typing import Dict, Any
+import hashlib
+import threading
+
+from src.utils.rate_limit import gemini_call
+
+# Responses keyed by a digest of (model, temperature, prompt)
+_responses: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+
+def _prompt_key(llm, prompt: str) -> str:
+    """Digest identifying one deterministic LLM request."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in (str(llm.model), str(llm.temperature), prompt):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def cached_invoke(llm, prompt: str):
+    """
+    Invoke a temperature-0 evaluation LLM, reusing the reply to an identical prompt.
+
+    Repeat runs and ablation configs often ask the judge and RAGAS the same
+    question about the same text. Failed calls raise and are not cached.
+
+    Args:
+        llm: Chat model with .model, .temperature and .invoke
+        prompt: Full prompt text
+
+    Returns:
+        The model's response message
+    """
+    key = _prompt_key(llm, prompt)
+
+    with _lock:
+        cached = _responses.get(key)
+    if cached is not None:
+        return cached
+
+    response = gemini_call(llm.invoke, prompt)
+
+    with _lock:
+        _responses[key] = response
+    return response
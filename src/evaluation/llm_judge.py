@@ -1,13 +1,17 @@
 """LLM-as-Judge evaluation."""
 from typing import Dict
-from langchain_google_genai import ChatGoogleGenerativeAI
 import json
-import sys
-import os
+import string
 
-# Add parent directory to path for config import
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import config
+from src.utils.llm import get_llm
+from .llm_cache import cached_invoke
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 JUDGE_PROMPT = """Sen bir finansal analiz degerlendirmecisisin. Asagidaki hisse analiz raporunu degerlendir.
@@ -72,16 +76,23 @@ SADECE asagidaki JSON formatinda yanit ver, baska hicbir sey yazma:
   "weaknesses": ["<zayif yon 1>", "<zayif yon 2>"]
 }}"""
 
+# JUDGE_PROMPT converted once to a string.Template, so each evaluation only
+# substitutes the three fields instead of re-parsing the format string
+_JUDGE_TEMPLATE = string.Template(
+    JUDGE_PROMPT
+    .replace("{{", "{").replace("}}", "}")
+    .replace("{query}", "$query")
+    .replace("{response}", "$response")
+    .replace("{sources}", "$sources")
+)
+
 
 class LLMJudge:
     """LLM-based evaluation judge."""
 
     def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
-            model=config.GEMINI_MODEL,
-            google_api_key=config.GEMINI_API_KEY,
-            temperature=0
-        )
+        # Shared with the other evaluator: same model, temperature 0
+        self.llm = get_llm(config.GEMINI_MODEL, 0)
 
     def evaluate(
         self,
@@ -100,24 +111,25 @@ class LLMJudge:
         Returns:
             Evaluation results dictionary
         """
-        prompt = JUDGE_PROMPT.format(
+        prompt = _JUDGE_TEMPLATE.substitute(
             query=query,
             response=response[:3000],
             sources=sources[:1500]
         )
 
         try:
-            result = self.llm.invoke(prompt)
+            result = cached_invoke(self.llm, prompt)
 
             # Parse JSON response
             content = result.content.strip()
 
-            # Try to extract JSON from response
-            if "{" in content:
-                json_start = content.index("{")
-                json_end = content.rindex("}") + 1
+            # Try to extract JSON from response: outermost {...} span, found
+            # with one forward and one backward scan
+            json_start = content.find("{")
+            json_end = content.rfind("}") + 1
+            if 0 <= json_start < json_end:
                 json_str = content[json_start:json_end]
-                scores = json.loads(json_str)
+                scores = orjson.loads(json_str) if ORJSON_AVAILABLE else json.loads(json_str)
             else:
                 scores = self._default_scores()
 
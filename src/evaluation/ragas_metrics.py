@@ -1,23 +1,19 @@
 """RAGAS-based evaluation metrics."""
 from typing import List, Dict
-from langchain_google_genai import ChatGoogleGenerativeAI
-import sys
-import os
+from concurrent.futures import ThreadPoolExecutor
+import json
 
-# Add parent directory to path for config import
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import config
+from src.utils.llm import get_llm
+from .llm_cache import cached_invoke
 
 
 class RAGASEvaluator:
     """Evaluate RAG quality using RAGAS-style metrics."""
 
     def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
-            model=config.GEMINI_MODEL,
-            google_api_key=config.GEMINI_API_KEY,
-            temperature=0
-        )
+        # Shared with the other evaluator: same model, temperature 0
+        self.llm = get_llm(config.GEMINI_MODEL, 0)
 
     def evaluate(
         self,
@@ -38,22 +34,25 @@ class RAGASEvaluator:
         Returns:
             Dictionary of metric scores
         """
-        results = {}
-
-        # Faithfulness: Is the answer grounded in context?
-        results["faithfulness"] = self._compute_faithfulness(response, contexts)
-
-        # Answer Relevancy: Is the answer relevant to the question?
-        results["answer_relevancy"] = self._compute_answer_relevancy(query, response)
-
-        # Context Precision: Are retrieved contexts relevant?
-        results["context_precision"] = self._compute_context_precision(query, contexts)
-
-        # Context Recall: Did we retrieve all needed info?
-        if ground_truth:
-            results["context_recall"] = self._compute_context_recall(ground_truth, contexts)
-
-        return results
+        # Each metric is an independent LLM call, so they run concurrently;
+        # every call still waits for the shared Gemini rate limiter
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {
+                # Faithfulness: Is the answer grounded in context?
+                "faithfulness": executor.submit(self._compute_faithfulness, response, contexts),
+                # Answer Relevancy: Is the answer relevant to the question?
+                "answer_relevancy": executor.submit(self._compute_answer_relevancy, query, response),
+                # Context Precision: Are retrieved contexts relevant?
+                "context_precision": executor.submit(self._compute_context_precision, query, contexts),
+            }
+
+            # Context Recall: Did we retrieve all needed info?
+            if ground_truth:
+                futures["context_recall"] = executor.submit(
+                    self._compute_context_recall, ground_truth, contexts
+                )
+
+            return {metric: future.result() for metric, future in futures.items()}
 
     def _compute_faithfulness(self, response: str, contexts: List[str]) -> float:
         """Check if response claims are supported by context."""
@@ -78,7 +77,7 @@ Her iddiayi kontrol et ve 0-1 arasi bir puan ver:
 Sadece sayisal puani ver (0 ile 1 arasi ondalikli sayi):"""
 
         try:
-            result = self.llm.invoke(prompt)
+            result = cached_invoke(self.llm, prompt)
             score = float(result.content.strip())
             return max(0.0, min(1.0, score))
         except:
@@ -100,19 +99,45 @@ Alaka duzeyini 0-1 arasi puanla:
 Sadece sayisal puani ver:"""
 
         try:
-            result = self.llm.invoke(prompt)
+            result = cached_invoke(self.llm, prompt)
             score = float(result.content.strip())
             return max(0.0, min(1.0, score))
         except:
             return 0.5
 
     def _compute_context_precision(self, query: str, contexts: List[str]) -> float:
-        """Check if retrieved contexts are relevant to query."""
+        """Check if retrieved contexts are relevant to query (one batched LLM call)."""
         if not contexts:
             return 0.0
 
+        contexts = contexts[:5]
+        passages = "\n\n".join(f"[{i}] {ctx[:500]}" for i, ctx in enumerate(contexts, 1))
+
+        prompt = f"""Asagidaki {len(contexts)} metnin her biri verilen soruyla alakali mi?
+
+Soru: {query}
+
+Metinler:
+{passages}
+
+Sadece metin sirasiyla bir JSON boolean listesi yaz (ornek: [true, false]):"""
+
+        try:
+            result = cached_invoke(self.llm, prompt)
+            content = result.content.strip()
+            verdicts = json.loads(content[content.index("["):content.rindex("]") + 1])
+            if len(verdicts) == len(contexts) and all(isinstance(v, bool) for v in verdicts):
+                return sum(verdicts) / len(contexts)
+        except Exception:
+            pass
+
+        # Unparseable batch answer: ask per context
+        return self._compute_context_precision_each(query, contexts)
+
+    def _compute_context_precision_each(self, query: str, contexts: List[str]) -> float:
+        """Per-context yes/no relevance checks, one LLM call each."""
         relevant_count = 0
-        for ctx in contexts[:5]:
+        for ctx in contexts:
             prompt = f"""Bu metin verilen soruyla alakali mi?
 
 Soru: {query}
@@ -122,13 +147,13 @@ Metin: {ctx[:500]}
 Sadece 'Evet' veya 'Hayir' yaz:"""
 
             try:
-                result = self.llm.invoke(prompt)
+                result = cached_invoke(self.llm, prompt)
                 if "evet" in result.content.lower():
                     relevant_count += 1
             except:
                 pass
 
-        return relevant_count / min(len(contexts), 5)
+        return relevant_count / len(contexts)
 
     def _compute_context_recall(self, ground_truth: str, contexts: List[str]) -> float:
         """Check if contexts contain info needed to answer."""
@@ -147,7 +172,7 @@ Bilgilerin ne kadarinin kaynaklarda bulundugunu 0-1 arasi puanla:
 Sadece sayisal puani ver:"""
 
         try:
-            result = self.llm.invoke(prompt)
+            result = cached_invoke(self.llm, prompt)
             score = float(result.content.strip())
             return max(0.0, min(1.0, score))
         except:
@@ -15,6 +15,8 @@ def run_full_evaluation():
     print("BIST Analysis Agent - Full Evaluation Suite")
     print("="*60)
 
+    config.ensure_dirs()
+
     # Get test queries
     test_queries = config.TEST_QUERIES
     print(f"\nLoaded {len(test_queries)} test queries")
@@ -2,6 +2,30 @@
 from typing import List, Dict
 
 
+def _ok(output: any) -> bool:
+    """Tool outputs are dicts carrying an `error` field on failure."""
+    return isinstance(output, dict) and not output.get("error")
+
+
+# Per-tool validity checks, keyed by the tool_outputs names used by the
+# ablation runner; a tool that returns an empty or placeholder dict is invalid
+_VALIDATORS = {
+    "stock": lambda o: _ok(o) and o.get("current_price") is not None,
+    "macro": lambda o: _ok(o) and bool(o.get("indicators")),
+    "technical": lambda o: _ok(o) and o.get("current_price") is not None,
+    "portfolio": lambda o: _ok(o) and bool(o.get("found") or o.get("portfolios")),
+}
+
+
+def _is_valid_generic(output: any) -> bool:
+    """Fallback check for outputs without a dedicated validator."""
+    if isinstance(output, dict):
+        return not output.get("error")
+    if isinstance(output, str):
+        return len(output) > 10
+    return True
+
+
 class ToolMetrics:
     """Evaluate tool usage quality."""
 
@@ -24,28 +48,25 @@ class ToolMetrics:
         """
         results = {}
 
+        # Called tools that were expected, counted once for all three scores
+        correct_calls = len(frozenset(tools_called) & frozenset(expected_tools))
+
         # Tool Selection Precision: % of called tools that were necessary
         if tools_called:
-            correct_calls = len(set(tools_called) & set(expected_tools))
             results["tool_precision"] = correct_calls / len(tools_called)
         else:
             results["tool_precision"] = 0.0 if expected_tools else 1.0
 
         # Tool Selection Recall: % of necessary tools that were called
         if expected_tools:
-            correct_calls = len(set(tools_called) & set(expected_tools))
             results["tool_recall"] = correct_calls / len(expected_tools)
         else:
             results["tool_recall"] = 1.0 if not tools_called else 0.0
 
-        # Tool F1 Score
-        if results["tool_precision"] + results["tool_recall"] > 0:
-            results["tool_f1"] = (
-                2 * results["tool_precision"] * results["tool_recall"] /
-                (results["tool_precision"] + results["tool_recall"])
-            )
-        else:
-            results["tool_f1"] = 0.0
+        # Tool F1 Score: harmonic mean of k/|called| and k/|expected| is
+        # 2k / (|called| + |expected|); nothing called and nothing expected is perfect
+        total_calls = len(tools_called) + len(expected_tools)
+        results["tool_f1"] = 2 * correct_calls / total_calls if total_calls else 1.0
 
         # Tool Output Validity
         if tool_outputs:
@@ -63,13 +84,4 @@ class ToolMetrics:
         """Check if tool output is valid."""
         if output is None:
             return False
-
-        if isinstance(output, dict):
-            if output.get("error"):
-                return False
-            return True
-
-        if isinstance(output, str):
-            return len(output) > 10
-
-        return True
+        return _VALIDATORS.get(tool_name, _is_valid_generic)(output)
@@ -1,14 +1,16 @@
 from .document_generator import generate_financial_documents
-from .chunking import chunk_documents
-from .embeddings import get_embeddings, embed_texts
+from .chunking import chunk_documents, iter_chunks
+from .embeddings import get_embeddings, embed_texts, embed_query
 from .vector_store import VectorStore
 from .retrieval import RAGRetriever
 
 __all__ = [
     "generate_financial_documents",
     "chunk_documents",
+    "iter_chunks",
     "get_embeddings",
     "embed_texts",
+    "embed_query",
     "VectorStore",
     "RAGRetriever",
 ]
@@ -1,74 +1,80 @@
 """Document chunking for RAG."""
-from typing import List
+from typing import List, Iterator
+from itertools import accumulate
 import sys
-import os
 
-# Add parent directory to path for config import
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import config
 
 
-def chunk_documents(documents: list) -> list:
+def iter_chunks(documents: list) -> Iterator[dict]:
     """
-    Chunk documents into smaller pieces for embedding.
+    Lazily chunk documents into smaller pieces for embedding.
+
+    Metadata strings repeat across thousands of chunks, so they are interned.
 
     Args:
         documents: List of document dictionaries
 
-    Returns:
-        List of chunk dictionaries with metadata
+    Yields:
+        Chunk dictionaries with metadata
     """
-    chunks = []
     chunk_id = 0
 
     for doc in documents:
-        ticker = doc.get("ticker", "GENERAL")
-        doc_type = doc.get("document_type", "unknown")
-        sector = doc.get("sector", "N/A")
+        ticker = sys.intern(doc.get("ticker", "GENERAL"))
+        doc_type = sys.intern(doc.get("document_type", "unknown"))
+        sector = sys.intern(doc.get("sector", "N/A"))
 
         for section in doc.get("sections", []):
-            section_name = section.get("section", "Unknown")
+            section_name = sys.intern(section.get("section", "Unknown"))
             content = section.get("content", "")
 
-            # Split content into chunks
+            # Split content into chunks: words[start:end] is the current
+            # chunk, and its length comes from prefix sums of (word + space)
             words = content.split()
-            current_chunk = []
-            current_length = 0
+            offsets = [0, *accumulate(len(w) + 1 for w in words)]
+            start = 0
 
-            for word in words:
-                current_chunk.append(word)
-                current_length += len(word) + 1
-
-                if current_length >= config.CHUNK_SIZE:
-                    chunk_text = " ".join(current_chunk)
-                    chunks.append({
+            for end in range(1, len(words) + 1):
+                if offsets[end] - offsets[start] >= config.CHUNK_SIZE:
+                    yield {
                         "id": f"chunk_{chunk_id}",
-                        "text": chunk_text,
+                        "text": " ".join(words[start:end]),
                         "ticker": ticker,
                         "document_type": doc_type,
                         "section": section_name,
                         "sector": sector,
-                    })
+                    }
                     chunk_id += 1
 
-                    # Overlap
-                    overlap_words = current_chunk[-config.CHUNK_OVERLAP:]
-                    current_chunk = overlap_words
-                    current_length = sum(len(w) + 1 for w in overlap_words)
+                    # Overlap: the next chunk starts with the last CHUNK_OVERLAP words
+                    start = max(start, end - config.CHUNK_OVERLAP)
 
             # Remaining content
-            if current_chunk:
-                chunk_text = " ".join(current_chunk)
+            if start < len(words):
+                chunk_text = " ".join(words[start:])
                 if len(chunk_text.strip()) > 50:  # Minimum chunk size
-                    chunks.append({
+                    yield {
                         "id": f"chunk_{chunk_id}",
                         "text": chunk_text,
                         "ticker": ticker,
                         "document_type": doc_type,
                         "section": section_name,
                         "sector": sector,
-                    })
+                    }
                     chunk_id += 1
 
+
+def chunk_documents(documents: list) -> list:
+    """
+    Chunk documents into smaller pieces for embedding.
+
+    Args:
+        documents: List of document dictionaries
+
+    Returns:
+        List of chunk dictionaries with metadata
+    """
+    chunks = list(iter_chunks(documents))
     print(f"Created {len(chunks)} chunks from {len(documents)} documents")
     return chunks
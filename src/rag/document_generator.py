@@ -1,25 +1,57 @@
 """Generate financial documents from API data for RAG indexing."""
+import copy
 import json
 from pathlib import Path
 from datetime import datetime
-import sys
-import os
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 
-# Add parent directory to path for config import
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import config
+from src.tools.cache import cached_ticker_info, get_ticker
+from src.utils.helpers import safe_format
 
+# Borsapy fetches are blocking HTTP calls, so tickers are fetched on threads
+FETCH_WORKERS = 16
 
-def generate_company_document(ticker: str) -> dict:
+SECTORS = {
+    "Bankacilik": ["AKBNK", "GARAN", "YKBNK"],
+    "Havacilik": ["THYAO", "PGSUS"],
+    "Holding": ["KCHOL", "SAHOL"],
+    "Enerji": ["TUPRS"],
+    "Sanayi": ["EREGL", "SISE"],
+    "Perakende": ["BIMAS"],
+    "Telekomunikasyon": ["TCELL"],
+}
+
+
+def _fetch_snapshot(ticker: str):
+    """Ticker snapshot, or None if it could not be fetched."""
+    try:
+        return cached_ticker_info(ticker)
+    except:
+        return None
+
+
+def prefetch_snapshots(tickers) -> dict:
+    """Fetch the snapshots of all tickers concurrently, keyed by ticker."""
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(tickers))) as executor:
+        return dict(zip(tickers, executor.map(_fetch_snapshot, tickers)))
+
+
+def generate_company_document(ticker: str, snapshot: dict = None) -> dict:
     """Generate a comprehensive document for a company using borsapy data."""
     try:
-        import borsapy as bp
-        stock = bp.Ticker(ticker)
-        info = stock.info
-        fast_info = stock.fast_info
+        snapshot = snapshot or cached_ticker_info(ticker)
+        info = snapshot["info"]
+        fast_info = snapshot["fast_info"]
 
         # Get financial statements
         try:
+            stock = get_ticker(ticker)
             balance_sheet = stock.balance_sheet
             income_stmt = stock.income_stmt
             has_financials = balance_sheet is not None and income_stmt is not None
@@ -29,12 +61,11 @@ def generate_company_document(ticker: str) -> dict:
             income_stmt = None
 
         # Get analyst data
-        try:
-            analyst_targets = stock.analyst_price_targets
-            recommendations = stock.recommendations_summary
-        except:
-            analyst_targets = None
-            recommendations = None
+        analyst_targets = snapshot["analyst_price_targets"]
+
+        # Used both in the sections and in the document metadata
+        company_name = info.get('longName', info.get('shortName', ticker))
+        sector = info.get('sector', 'N/A')
 
         # Build document sections
         sections = []
@@ -43,9 +74,9 @@ def generate_company_document(ticker: str) -> dict:
         sections.append({
             "section": "Sirket Profili",
             "content": f"""
-{ticker} - {info.get('longName', info.get('shortName', ticker))}
+{ticker} - {company_name}
 
-Sektor: {info.get('sector', 'N/A')}
+Sektor: {sector}
 Alt Sektor: {info.get('industry', 'N/A')}
 Web Sitesi: {info.get('website', 'N/A')}
 
@@ -61,7 +92,7 @@ Faaliyet Alani:
 {ticker} Piyasa Bilgileri
 
 Guncel Fiyat: {fast_info.get('last_price', 'N/A')} TL
-Piyasa Degeri: {fast_info.get('market_cap', 'N/A'):,.0f} TL
+Piyasa Degeri: {safe_format(fast_info.get('market_cap'), ',.0f')} TL
 Halka Aciklik Orani: {fast_info.get('free_float', 'N/A')}%
 Yabanci Payi: {fast_info.get('foreign_ratio', 'N/A')}%
 
@@ -137,8 +168,8 @@ tek basina karar vermek icin yeterli degildir.
 
         return {
             "ticker": ticker,
-            "company_name": info.get('longName', info.get('shortName', ticker)),
-            "sector": info.get('sector', 'N/A'),
+            "company_name": company_name,
+            "sector": sector,
             "document_type": "company_analysis",
             "generated_date": datetime.now().isoformat(),
             "sections": sections
@@ -160,39 +191,47 @@ def _get_portfolio_info(ticker: str) -> str:
     if not data.get("found"):
         return ""
 
-    content = f"{ticker} Kurumsal Gorusler\n\n"
-    content += f"Toplam {data['consensus']['coverage_count']} kurum tarafindan takip edilmektedir.\n"
-    content += f"AL Onerisi: {data['consensus']['buy_count']} kurum\n"
-    content += f"TUT Onerisi: {data['consensus']['hold_count']} kurum\n"
-    content += f"Ortalama Hedef Fiyat: {data['consensus']['average_target']:.2f} TL\n\n"
-
-    for rec in data["recommendations"]:
-        content += f"- {rec['institution']}: {rec['rating']} (Hedef: {rec['target_price']} TL)\n"
-
-    return content
+    consensus = data["consensus"]
+    parts = [
+        f"{ticker} Kurumsal Gorusler",
+        "",
+        f"Toplam {consensus['coverage_count']} kurum tarafindan takip edilmektedir.",
+        f"AL Onerisi: {consensus['buy_count']} kurum",
+        f"TUT Onerisi: {consensus['hold_count']} kurum",
+        f"Ortalama Hedef Fiyat: {consensus['average_target']:.2f} TL",
+        "",
+    ]
+    parts.extend(
+        f"- {rec['institution']}: {rec['rating']} (Hedef: {rec['target_price']} TL)"
+        for rec in data["recommendations"]
+    )
+
+    return "\n".join(parts) + "\n"
+
+
+def _sector_entry(ticker: str, snapshot: dict) -> dict:
+    """Sector comparison fields for a ticker, or None without a snapshot."""
+    if not snapshot:
+        return None
+    info = snapshot["info"]
+    fast_info = snapshot["fast_info"]
+    return {
+        "ticker": ticker,
+        "name": info.get('shortName', ticker),
+        "price": fast_info.get('last_price'),
+        "pe": fast_info.get('pe_ratio'),
+        "market_cap": fast_info.get('market_cap'),
+    }
 
 
-def generate_sector_document(sector_name: str, tickers: list) -> dict:
+def generate_sector_document(sector_name: str, tickers: list, snapshots: dict = None) -> dict:
     """Generate a sector analysis document."""
     sections = []
 
     # Collect data for all tickers in sector
-    sector_data = []
-    for ticker in tickers:
-        try:
-            import borsapy as bp
-            stock = bp.Ticker(ticker)
-            info = stock.info
-            fast_info = stock.fast_info
-            sector_data.append({
-                "ticker": ticker,
-                "name": info.get('shortName', ticker),
-                "price": fast_info.get('last_price'),
-                "pe": fast_info.get('pe_ratio'),
-                "market_cap": fast_info.get('market_cap'),
-            })
-        except:
-            pass
+    if snapshots is None:
+        snapshots = prefetch_snapshots(tickers)
+    sector_data = [d for t in tickers if (d := _sector_entry(t, snapshots.get(t)))]
 
     # Sector overview
     sections.append({
@@ -210,12 +249,15 @@ icin cesitli firsatlar sunmaktadir.
 
     # Company comparison
     if sector_data:
-        comparison = f"{sector_name} Sirket Karsilastirmasi\n\n"
+        parts = [f"{sector_name} Sirket Karsilastirmasi\n\n"]
         for d in sector_data:
-            comparison += f"**{d['ticker']}** - {d.get('name', 'N/A')}\n"
-            comparison += f"  Fiyat: {d.get('price', 'N/A')} TL\n"
-            comparison += f"  F/K: {d.get('pe', 'N/A')}\n"
-            comparison += f"  Piyasa Degeri: {d.get('market_cap', 'N/A'):,.0f} TL\n\n"
+            parts.append(
+                f"**{d['ticker']}** - {d.get('name', 'N/A')}\n"
+                f"  Fiyat: {d.get('price', 'N/A')} TL\n"
+                f"  F/K: {d.get('pe', 'N/A')}\n"
+                f"  Piyasa Degeri: {safe_format(d.get('market_cap'), ',.0f')} TL\n\n"
+            )
+        comparison = "".join(parts)
 
         sections.append({
             "section": "Sirket Karsilastirmasi",
@@ -231,7 +273,14 @@ icin cesitli firsatlar sunmaktadir.
 
 
 def generate_macro_document() -> dict:
-    """Generate macroeconomic analysis document."""
+    """Generate macroeconomic analysis document (rendered at most once per day)."""
+    # The cached document is shared; callers get their own copy
+    return copy.deepcopy(_macro_document_for(datetime.now().strftime('%Y-%m-%d')))
+
+
+@lru_cache(maxsize=1)
+def _macro_document_for(date_str: str) -> dict:
+    """Render the macro document; the date only keys the cache."""
     from src.tools.macro_data import get_macro_data
 
     macro_data = get_macro_data()
@@ -301,28 +350,28 @@ def generate_financial_documents() -> list:
 
     print("Generating financial documents from API data...")
 
-    # Generate company documents
-    for ticker in config.TARGET_TICKERS:
-        print(f"  Processing {ticker}...")
-        doc = generate_company_document(ticker)
-        if doc.get("sections"):
-            documents.append(doc)
+    # Fetch every company and sector ticker once, up front; both passes
+    # below read from these snapshots
+    tickers = config.TARGET_TICKERS_ORDERED
+    all_tickers = list(dict.fromkeys(chain(tickers, *SECTORS.values())))
+    print(f"  Fetching {len(all_tickers)} tickers...")
+    snapshots = prefetch_snapshots(all_tickers)
+
+    # Generate company documents; financial statements are still fetched
+    # per company, so this stays threaded (map() keeps ticker order)
+    print(f"  Processing {len(tickers)} companies...")
+    with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(tickers))) as executor:
+        documents.extend(
+            doc for doc in executor.map(
+                generate_company_document, tickers, (snapshots.get(t) for t in tickers)
+            )
+            if doc.get("sections")
+        )
 
     # Generate sector documents
-    sectors = {
-        "Bankacilik": ["AKBNK", "GARAN", "YKBNK"],
-        "Havacilik": ["THYAO", "PGSUS"],
-        "Holding": ["KCHOL", "SAHOL"],
-        "Enerji": ["TUPRS"],
-        "Sanayi": ["EREGL", "SISE"],
-        "Perakende": ["BIMAS"],
-        "Telekomunikasyon": ["TCELL"],
-    }
-
-    for sector_name, tickers in sectors.items():
-        print(f"  Processing {sector_name} sector...")
-        doc = generate_sector_document(sector_name, tickers)
-        documents.append(doc)
+    print(f"  Processing {len(SECTORS)} sectors...")
+    for sector_name, sector_tickers in SECTORS.items():
+        documents.append(generate_sector_document(sector_name, sector_tickers, snapshots))
 
     # Generate macro document
     print("  Processing macro data...")
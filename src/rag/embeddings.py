@@ -1,15 +1,57 @@
-"""Embedding generation using Gemini."""
+"""Embedding generation using Gemini (or a local encoder, see config.EMBEDDING_BACKEND)."""
 from typing import List
-import google.generativeai as genai
-import sys
-import os
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+import shelve
+import threading
 
-# Add parent directory to path for config import
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import config
+from src.utils.rate_limit import gemini_call
 
-# Configure Gemini
-genai.configure(api_key=config.GEMINI_API_KEY)
+# Guards the on-disk query embedding cache across threads
+_query_cache_lock = threading.Lock()
+
+# Concurrent embedding requests per get_embeddings call
+EMBED_WORKERS = 8
+
+
+@lru_cache(maxsize=1)
+def _genai():
+    """Import and configure the Gemini SDK on first use (it is slow to import)."""
+    import google.generativeai as genai
+    genai.configure(api_key=config.GEMINI_API_KEY)
+    return genai
+
+
+def _embed_one(text: str, task_type: str) -> List[float]:
+    """Embed a single text, returning a zero vector on error."""
+    try:
+        result = gemini_call(
+            _genai().embed_content,
+            model=config.EMBEDDING_MODEL,
+            content=text,
+            task_type=task_type
+        )
+        return result['embedding']
+    except Exception as e:
+        print(f"Embedding error: {e}")
+        return [0.0] * config.EMBEDDING_DIMENSION
+
+
+def _embed_batch(batch: List[str], task_type: str) -> List[List[float]]:
+    """Embed one batch in a single request, falling back to per-text calls."""
+    try:
+        result = gemini_call(
+            _genai().embed_content,
+            model=config.EMBEDDING_MODEL,
+            content=batch,
+            task_type=task_type
+        )
+        return result['embedding']
+    except Exception as e:
+        print(f"Batch embedding error: {e}")
+        # Retry one by one so a single bad text doesn't zero the batch
+        return [_embed_one(text, task_type) for text in batch]
 
 
 def get_embeddings(texts: List[str], task_type: str = "retrieval_document") -> List[List[float]]:
@@ -23,28 +65,23 @@ def get_embeddings(texts: List[str], task_type: str = "retrieval_document") -> L
     Returns:
         List of embedding vectors
     """
-    embeddings = []
+    if config.EMBEDDING_BACKEND == "local":
+        from .local_embeddings import get_local_embeddings
+        return get_local_embeddings(texts, task_type)
 
     # Process in batches (Gemini has limits)
     batch_size = 100
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
 
-    for i in range(0, len(texts), batch_size):
-        batch = texts[i:i + batch_size]
-
-        for text in batch:
-            try:
-                result = genai.embed_content(
-                    model=config.EMBEDDING_MODEL,
-                    content=text,
-                    task_type=task_type
-                )
-                embeddings.append(result['embedding'])
-            except Exception as e:
-                print(f"Embedding error: {e}")
-                # Return zero vector on error
-                embeddings.append([0.0] * config.EMBEDDING_DIMENSION)
+    if len(batches) <= 1:
+        return _embed_batch(texts, task_type) if texts else []
 
-    return embeddings
+    # Batches are independent requests; run up to EMBED_WORKERS at once.
+    # Every request still waits on the shared Gemini rate limiter, and
+    # map() keeps the batches in order.
+    with ThreadPoolExecutor(max_workers=min(EMBED_WORKERS, len(batches))) as executor:
+        results = executor.map(lambda batch: _embed_batch(batch, task_type), batches)
+        return [e for batch_embeddings in results for e in batch_embeddings]
 
 
 def embed_texts(texts: List[str], is_query: bool = False) -> List[List[float]]:
@@ -60,3 +97,99 @@ def embed_texts(texts: List[str], is_query: bool = False) -> List[List[float]]:
     """
     task_type = "retrieval_query" if is_query else "retrieval_document"
     return get_embeddings(texts, task_type)
+
+
+class _EmbeddingFailed(Exception):
+    """Raised so lru_cache does not memoize the zero vector of a failed call."""
+
+
+@lru_cache(maxsize=1024)
+def _query_embedding(text: str) -> tuple:
+    """Query embedding from the disk cache or the API, memoized in process."""
+    key = f"{config.EMBEDDING_MODEL}:{text}"
+    config.ensure_dirs()
+
+    with _query_cache_lock:
+        try:
+            with shelve.open(str(config.QUERY_EMBEDDING_CACHE)) as cache:
+                if key in cache:
+                    return tuple(cache[key])
+        except Exception as e:
+            print(f"Embedding cache read error: {e}")
+
+    embedding = get_embeddings([text], task_type="retrieval_query")[0]
+
+    # Don't persist the zero vector returned on API errors
+    if not any(embedding):
+        raise _EmbeddingFailed(text)
+
+    with _query_cache_lock:
+        try:
+            with shelve.open(str(config.QUERY_EMBEDDING_CACHE)) as cache:
+                cache[key] = embedding
+        except Exception as e:
+            print(f"Embedding cache write error: {e}")
+
+    return tuple(embedding)
+
+
+def embed_query(text: str) -> List[float]:
+    """
+    Embed a search query, reusing embeddings persisted on disk.
+
+    Query embeddings are deterministic for a given model, so repeated
+    queries skip the Gemini call, including across app restarts. Recent
+    queries are also kept in memory, so follow-up searches (and the
+    vector-only fallback of hybrid search) skip the disk cache too.
+
+    Args:
+        text: Query text
+
+    Returns:
+        Embedding vector
+    """
+    try:
+        return list(_query_embedding(text))
+    except _EmbeddingFailed:
+        return [0.0] * config.EMBEDDING_DIMENSION
+
+
+def prefetch_query_embeddings(texts: List[str]) -> int:
+    """
+    Embed uncached queries in one batched request and persist them.
+
+    Later embed_query calls for these texts are then served from disk.
+
+    Args:
+        texts: Query texts
+
+    Returns:
+        Number of queries newly embedded
+    """
+    config.ensure_dirs()
+    keys = {f"{config.EMBEDDING_MODEL}:{text}": text for text in texts}
+
+    with _query_cache_lock:
+        try:
+            with shelve.open(str(config.QUERY_EMBEDDING_CACHE)) as cache:
+                missing = [key for key in keys if key not in cache]
+        except Exception as e:
+            print(f"Embedding cache read error: {e}")
+            return 0
+
+    if not missing:
+        return 0
+
+    embeddings = get_embeddings([keys[key] for key in missing], task_type="retrieval_query")
+
+    with _query_cache_lock:
+        try:
+            with shelve.open(str(config.QUERY_EMBEDDING_CACHE)) as cache:
+                for key, embedding in zip(missing, embeddings):
+                    # Don't persist the zero vector returned on API errors
+                    if any(embedding):
+                        cache[key] = embedding
+        except Exception as e:
+            print(f"Embedding cache write error: {e}")
+
+    return len(missing)
@@ -0,0 +1,40 @@
+"""Local CPU embeddings with sentence-transformers."""
+from typing import List
+from functools import lru_cache
+
+import config
+
+# E5 models are trained with these input prefixes
+_PREFIXES = {"retrieval_query": "query: ", "retrieval_document": "passage: "}
+BATCH_SIZE = 32
+
+
+@lru_cache(maxsize=1)
+def _model():
+    """Load the encoder once per process."""
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(config.EMBEDDING_MODEL, device="cpu")
+
+
+def get_local_embeddings(texts: List[str], task_type: str = "retrieval_document") -> List[List[float]]:
+    """
+    Embed texts with the local encoder.
+
+    Args:
+        texts: List of texts to embed
+        task_type: Either "retrieval_document" or "retrieval_query"
+
+    Returns:
+        List of unit-normalized embedding vectors
+    """
+    if not texts:
+        return []
+
+    prefix = _PREFIXES.get(task_type, "")
+    vectors = _model().encode(
+        [prefix + text for text in texts],
+        batch_size=BATCH_SIZE,
+        normalize_embeddings=True,
+        show_progress_bar=False,
+    )
+    return vectors.tolist()
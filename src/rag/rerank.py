@@ -0,0 +1,50 @@
+"""Cosine-similarity reranking of retrieved candidates."""
+from typing import List
+import numpy as np
+
+
+def cosine_scores(vectors: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity of each row of vectors to query.
+
+    Args:
+        vectors: (n, dim) candidate embeddings
+        query: (dim,) query embedding
+
+    Returns:
+        (n,) similarity scores; zero vectors score 0
+    """
+    # One BLAS matrix-vector product; the norms are computed once per row
+    dots = vectors @ query
+    norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(query)
+    return np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+
+
+def rerank(results: List[dict], query_embedding: List[float], top_k: int) -> List[dict]:
+    """
+    Reorder search results by cosine similarity to the query.
+
+    Args:
+        results: Search results carrying a "vector" entry
+        query_embedding: Query embedding
+        top_k: Number of results to keep
+
+    Returns:
+        Best top_k results, each with a "rerank_score" and without "vector"
+    """
+    candidates = [r for r in results if r.get("vector") is not None]
+    if not candidates:
+        return [{k: v for k, v in r.items() if k != "vector"} for r in results[:top_k]]
+
+    vectors = np.asarray([r["vector"] for r in candidates], dtype=np.float32)
+    scores = cosine_scores(vectors, np.asarray(query_embedding, dtype=np.float32))
+
+    # Stable sort keeps the search order among equal scores
+    order = np.argsort(-scores, kind="stable")[:top_k]
+
+    reranked = []
+    for i in order:
+        r = {k: v for k, v in candidates[i].items() if k != "vector"}
+        r["rerank_score"] = float(scores[i])
+        reranked.append(r)
+    return reranked
@@ -1,11 +1,7 @@
 """RAG retrieval with reranking."""
 from typing import List, Optional
 from .vector_store import VectorStore
-import sys
-import os
 
-# Add parent directory to path for config import
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import config
 
 
@@ -21,7 +17,8 @@ class RAGRetriever:
         query: str,
         ticker: Optional[str] = None,
         top_k: int = None,
-        use_hybrid: bool = True
+        use_hybrid: bool = True,
+        rerank: bool = False
     ) -> List[dict]:
         """
         Retrieve relevant documents for a query.
@@ -31,6 +28,8 @@ class RAGRetriever:
             ticker: Optional ticker filter
             top_k: Number of results
             use_hybrid: Use hybrid search
+            rerank: Fetch RERANK_CANDIDATES_FACTOR * top_k candidates and
+                keep the top_k most cosine-similar to the query
 
         Returns:
             List of relevant documents with scores
@@ -38,18 +37,19 @@ class RAGRetriever:
         if top_k is None:
             top_k = config.TOP_K_RETRIEVAL
 
-        # Build filter
-        filter_str = None
-        if ticker:
-            filter_str = f"ticker = '{ticker.upper()}'"
+        filter_str = VectorStore.ticker_filter(ticker)
 
-        # Search
-        if use_hybrid:
-            results = self.vector_store.hybrid_search(query, top_k, filter_str)
-        else:
-            results = self.vector_store.search(query, top_k, filter_str)
+        search = self.vector_store.hybrid_search if use_hybrid else self.vector_store.search
 
-        return results
+        if not rerank:
+            return search(query, top_k, filter_str)
+
+        from .embeddings import embed_query
+        from .rerank import rerank as rerank_results
+
+        candidates = search(query, top_k * config.RERANK_CANDIDATES_FACTOR, filter_str, with_vectors=True)
+        # The query embedding is memoized, so this reuses the search's embedding
+        return rerank_results(candidates, embed_query(query), top_k)
 
     def retrieve_with_context(
         self,
@@ -77,22 +77,22 @@ class RAGRetriever:
                 "num_results": 0
             }
 
-        # Format context
-        context_parts = []
-        sources = []
-
-        for i, r in enumerate(results, 1):
-            source = f"{r['ticker']} - {r['document_type']} - {r['section']}"
-            context_parts.append(f"[Kaynak {i}: {source}]\n{r['text']}")
-            sources.append({
+        # Format context; each source label is built once and reused
+        sources = [
+            {
                 "index": i,
-                "source": source,
+                "source": f"{r['ticker']} - {r['document_type']} - {r['section']}",
                 "ticker": r["ticker"],
                 "section": r["section"]
-            })
+            }
+            for i, r in enumerate(results, 1)
+        ]
 
         return {
-            "context": "\n\n".join(context_parts),
+            "context": "\n\n".join(
+                f"[Kaynak {s['index']}: {s['source']}]\n{r['text']}"
+                for s, r in zip(sources, results)
+            ),
             "sources": sources,
             "num_results": len(results)
         }
@@ -1,26 +1,39 @@
 """Vector store using LanceDB."""
-from typing import List, Optional
-import lancedb
+from typing import List, Optional, Iterable, Tuple
 from pathlib import Path
-import sys
-import os
 
-# Add parent directory to path for config import
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import config
 
+# Columns read back from a search; LanceDB appends _distance itself
+RESULT_COLUMNS = ("text", "ticker", "document_type", "section", "sector")
+
+# Values accepted for config.VECTOR_INDEX_TYPE
+VECTOR_INDEX_TYPES = ("IVF_PQ", "IVF_HNSW_SQ")
+
 
 class VectorStore:
     """LanceDB vector store for financial documents."""
 
-    def __init__(self, db_path: str = None):
-        """Initialize vector store."""
+    def __init__(self, db_path: str = None, enable_fts: bool = True):
+        """
+        Initialize vector store.
+
+        Args:
+            db_path: LanceDB directory (defaults to config.EMBEDDINGS_DIR)
+            enable_fts: Build the full-text index hybrid_search needs; stores
+                only queried with search() can skip it
+        """
+        # Imported here: lancedb is slow to import and only needed once a store is opened
+        import lancedb
+
         if db_path is None:
+            config.ensure_dirs()
             db_path = str(config.EMBEDDINGS_DIR)
 
         self.db = lancedb.connect(db_path)
         self.table_name = "financial_documents"
         self.table = None
+        self.enable_fts = enable_fts
 
     def create_index(self, chunks: List[dict], embeddings: List[List[float]]):
         """
@@ -30,34 +43,138 @@ class VectorStore:
             chunks: List of chunk dictionaries with metadata
             embeddings: List of embedding vectors
         """
-        # Prepare data
-        data = []
-        for chunk, embedding in zip(chunks, embeddings):
-            data.append({
-                "id": chunk["id"],
-                "text": chunk["text"],
-                "ticker": chunk.get("ticker", "N/A"),
-                "document_type": chunk.get("document_type", "unknown"),
-                "section": chunk.get("section", "N/A"),
-                "sector": chunk.get("sector", "N/A"),
-                "vector": embedding
-            })
+        self.create_index_batches([(chunks, embeddings)])
 
+    def create_index_batches(self, batches: Iterable[Tuple[List[dict], List[List[float]]]]):
+        """
+        Create index from (chunks, embeddings) batches, appending one batch at a time.
+
+        Only the current batch's rows are held in memory, so callers can
+        chunk and embed lazily.
+
+        Args:
+            batches: Iterable of (chunk dictionaries, embedding vectors) pairs
+        """
         # Create or overwrite table
         if self.table_name in self.db.table_names():
             self.db.drop_table(self.table_name)
+        self.table = None
+        num_rows = 0
 
-        self.table = self.db.create_table(self.table_name, data)
+        for chunks, embeddings in batches:
+            if not chunks or not embeddings:
+                continue
 
-        # Create FTS index for hybrid search
+            data = self._arrow_batch(chunks, embeddings)
+
+            if self.table is None:
+                self.table = self.db.create_table(self.table_name, data)
+            else:
+                self.table.add(data)
+            num_rows += data.num_rows
+
+        if self.table is None:
+            print("No chunks to index")
+            return
+
+        # ANN index for large corpora; small ones are scanned exactly,
+        # which is both faster and lossless at that size
+        if num_rows >= config.VECTOR_INDEX_MIN_ROWS:
+            try:
+                self._create_vector_index(num_rows)
+            except Exception as e:
+                print(f"Vector index error (searches fall back to exact scan): {e}")
+
+        # Bitmap index on the low-cardinality ticker column, so ticker
+        # filters are resolved from the index instead of scanning every row
         try:
-            self.table.create_fts_index("text")
-        except:
-            pass  # FTS might already exist
+            self.table.create_scalar_index("ticker", index_type="BITMAP")
+        except Exception as e:
+            print(f"Ticker index error: {e}")
 
-        print(f"Indexed {len(data)} chunks in LanceDB")
+        # Create FTS index for hybrid search
+        if self.enable_fts:
+            try:
+                self.table.create_fts_index("text")
+            except:
+                pass  # FTS might already exist
+
+        print(f"Indexed {num_rows} chunks in LanceDB")
+
+    def _create_vector_index(self, num_rows: int):
+        """Build the config.VECTOR_INDEX_TYPE index over the vector column."""
+        index_type = config.VECTOR_INDEX_TYPE.upper()
+        if index_type not in VECTOR_INDEX_TYPES:
+            raise ValueError(
+                f"Unsupported VECTOR_INDEX_TYPE {config.VECTOR_INDEX_TYPE!r}; "
+                f"expected one of {', '.join(VECTOR_INDEX_TYPES)}"
+            )
+
+        kwargs = {
+            "metric": "L2",
+            "num_partitions": int(num_rows ** 0.5),
+            "index_type": index_type,
+        }
+        if index_type == "IVF_PQ":
+            kwargs["num_sub_vectors"] = config.EMBEDDING_DIMENSION // 8
+        else:
+            # Graph degree and build-time beam width
+            kwargs["m"] = 16
+            kwargs["ef_construction"] = 200
 
-    def search(self, query: str, top_k: int = 5, filter: str = None) -> List[dict]:
+        self.table.create_index(**kwargs)
+
+    @staticmethod
+    def ticker_filter(ticker: Optional[str]) -> Optional[str]:
+        """
+        Build the filter predicate for one ticker.
+
+        Args:
+            ticker: Stock symbol, or None for no filter
+
+        Returns:
+            Predicate on the indexed ticker column, or None
+        """
+        if not ticker:
+            return None
+        # Quotes are doubled so the symbol is always read as a literal
+        return "ticker = '{}'".format(ticker.upper().replace("'", "''"))
+
+    @staticmethod
+    def _arrow_batch(chunks: List[dict], embeddings: List[List[float]]):
+        """
+        Build a pyarrow Table for one batch of chunks.
+
+        The vectors go into a single config.VECTOR_DTYPE buffer, wrapped as
+        a fixed-size-list column, so LanceDB does not convert a Python list
+        per row.
+        """
+        import numpy as np
+        import pyarrow as pa
+
+        # Rows pair up like zip(chunks, embeddings)
+        n = min(len(chunks), len(embeddings))
+        chunks = chunks[:n]
+        vectors = np.asarray(embeddings[:n], dtype=config.VECTOR_DTYPE).reshape(-1)
+
+        return pa.table({
+            "id": pa.array([c["id"] for c in chunks], pa.string()),
+            "text": pa.array([c["text"] for c in chunks], pa.string()),
+            "ticker": pa.array([c.get("ticker", "N/A") for c in chunks], pa.string()),
+            "document_type": pa.array([c.get("document_type", "unknown") for c in chunks], pa.string()),
+            "section": pa.array([c.get("section", "N/A") for c in chunks], pa.string()),
+            "sector": pa.array([c.get("sector", "N/A") for c in chunks], pa.string()),
+            "vector": pa.FixedSizeListArray.from_arrays(pa.array(vectors), config.EMBEDDING_DIMENSION),
+        })
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        filter: str = None,
+        with_vectors: bool = False,
+        nprobes: int = None
+    ) -> List[dict]:
         """
         Search for similar documents.
 
@@ -65,6 +182,9 @@ class VectorStore:
             query: Search query
             top_k: Number of results
             filter: Optional SQL filter (e.g., "ticker = 'THYAO'")
+            with_vectors: Include each result's embedding under "vector"
+            nprobes: IVF partitions probed (more = better recall, slower);
+                only used once the table has an ANN index
 
         Returns:
             List of results with text and metadata
@@ -75,35 +195,33 @@ class VectorStore:
             except:
                 return []
 
-        from .embeddings import embed_texts
+        from .embeddings import embed_query
 
         # Get query embedding
-        query_embedding = embed_texts([query], is_query=True)[0]
+        query_embedding = embed_query(query)
 
         # Build search query
         search_query = self.table.search(query_embedding).limit(top_k)
 
+        if nprobes:
+            search_query = search_query.nprobes(nprobes)
+
         if filter:
             search_query = search_query.where(filter)
 
         # Execute search
-        results = search_query.to_list()
-
-        # Format results
-        formatted = []
-        for r in results:
-            formatted.append({
-                "text": r.get("text", ""),
-                "ticker": r.get("ticker", "N/A"),
-                "document_type": r.get("document_type", "unknown"),
-                "section": r.get("section", "N/A"),
-                "sector": r.get("sector", "N/A"),
-                "score": r.get("_distance", 0)
-            })
+        results = self._fetch(search_query, with_vectors)
 
-        return formatted
+        return self._format_results(results, with_vectors)
 
-    def hybrid_search(self, query: str, top_k: int = 5, filter: str = None) -> List[dict]:
+    def hybrid_search(
+        self,
+        query: str,
+        top_k: int = 5,
+        filter: str = None,
+        with_vectors: bool = False,
+        nprobes: int = None
+    ) -> List[dict]:
         """
         Hybrid search combining vector and FTS.
 
@@ -111,6 +229,9 @@ class VectorStore:
             query: Search query
             top_k: Number of results
             filter: Optional SQL filter
+            with_vectors: Include each result's embedding under "vector"
+            nprobes: IVF partitions probed (more = better recall, slower);
+                only used once the table has an ANN index
 
         Returns:
             List of results
@@ -121,9 +242,9 @@ class VectorStore:
             except:
                 return []
 
-        from .embeddings import embed_texts
+        from .embeddings import embed_query
 
-        query_embedding = embed_texts([query], is_query=True)[0]
+        query_embedding = embed_query(query)
 
         try:
             # Try hybrid search
@@ -132,15 +253,34 @@ class VectorStore:
                 query_type="hybrid"
             ).limit(top_k)
 
+            if nprobes:
+                search_query = search_query.nprobes(nprobes)
+
             if filter:
                 search_query = search_query.where(filter)
 
-            results = search_query.to_list()
+            results = self._fetch(search_query, with_vectors)
         except:
             # Fallback to vector-only search
-            results = self.search(query, top_k, filter)
+            results = self.search(query, top_k, filter, with_vectors, nprobes)
             return results
 
+        return self._format_results(results, with_vectors)
+
+    @staticmethod
+    def _fetch(search_query, with_vectors: bool) -> List[dict]:
+        """
+        Run a search, reading only the result columns.
+
+        The vector column is projected out unless requested, so LanceDB
+        neither loads it nor builds a 768-float list per row.
+        """
+        columns = list(RESULT_COLUMNS) + (["vector"] if with_vectors else [])
+        return search_query.select(columns).to_arrow().to_pylist()
+
+    @staticmethod
+    def _format_results(results: List[dict], with_vectors: bool) -> List[dict]:
+        """Format result rows with defaults for missing metadata."""
         formatted = []
         for r in results:
             formatted.append({
@@ -151,5 +291,7 @@ class VectorStore:
                 "sector": r.get("sector", "N/A"),
                 "score": r.get("_distance", 0)
             })
+            if with_vectors:
+                formatted[-1]["vector"] = r.get("vector")
 
         return formatted
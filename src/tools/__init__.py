@@ -1,13 +1,13 @@
 from .market_data import get_stock_data, StockDataTool
 from .macro_data import get_macro_data, MacroDataTool
-from .technicals import calculate_technicals, TechnicalsTool
+from .technicals import calculate_technicals, calculate_technicals_batch, TechnicalsTool
 from .model_portfolios import get_model_portfolios, ModelPortfoliosTool
-from .rag_search import search_documents, RAGSearchTool
+from .rag_search import search_documents, search_documents_many, RAGSearchTool
 
 __all__ = [
     "get_stock_data", "StockDataTool",
     "get_macro_data", "MacroDataTool",
-    "calculate_technicals", "TechnicalsTool",
+    "calculate_technicals", "calculate_technicals_batch", "TechnicalsTool",
     "get_model_portfolios", "ModelPortfoliosTool",
-    "search_documents", "RAGSearchTool",
+    "search_documents", "search_documents_many", "RAGSearchTool",
 ]
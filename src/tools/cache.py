@@ -0,0 +1,137 @@
+"""On-disk cache for borsapy ticker responses."""
+from typing import Any, Optional
+from functools import lru_cache
+import json
+import os
+import tempfile
+import time
+
+import config
+
+# fast_info fields read by the tools and document generator
+FAST_INFO_FIELDS = (
+    "last_price", "previous_close", "volume", "market_cap", "pe_ratio", "pb_ratio",
+    "free_float", "foreign_ratio", "year_high", "year_low",
+)
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize numpy scalars as Python numbers, anything else as text."""
+    if hasattr(obj, "item"):
+        return obj.item()
+    return str(obj)
+
+
+def _safe_attr(obj: Any, attr: str) -> Any:
+    """getattr that treats any lookup error as a missing value."""
+    try:
+        return getattr(obj, attr, None)
+    except:
+        return None
+
+
+class FileCache:
+    """JSON files stored as <root>/<ticker>/<endpoint>.json with a fetch timestamp."""
+
+    def __init__(self, root=None):
+        self.root = root or (config.CACHE_DIR / "borsapy")
+
+    def _path(self, ticker: str, endpoint: str):
+        return self.root / ticker.upper() / f"{endpoint}.json"
+
+    def get(self, ticker: str, endpoint: str, ttl: int) -> Optional[Any]:
+        """Return the cached data if younger than ttl seconds, else None."""
+        try:
+            with open(self._path(ticker, endpoint), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get("ts", 0) > ttl:
+            return None
+        return entry.get("data")
+
+    def set(self, ticker: str, endpoint: str, data: Any):
+        """Store data; the file is replaced atomically so readers never see a partial write."""
+        path = self._path(ticker, endpoint)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False
+            ) as f:
+                json.dump({"ts": time.time(), "data": data}, f, ensure_ascii=False, default=_json_default)
+            os.replace(f.name, path)
+        except OSError as e:
+            print(f"Ticker cache write error: {e}")
+
+
+_file_cache = FileCache()
+
+
+@lru_cache(maxsize=32)
+def _ticker(symbol: str):
+    import borsapy as bp
+    return bp.Ticker(symbol)
+
+
+def get_ticker(symbol: str):
+    """Shared borsapy Ticker per symbol, so one run never builds the same one twice."""
+    return _ticker(symbol.upper())
+
+
+def reset_ticker_cache():
+    """Drop the shared Ticker objects (long-running processes pick up fresh sessions)."""
+    _ticker.cache_clear()
+
+
+def cached_ticker_info(ticker: str, ttl: int = None) -> dict:
+    """
+    Snapshot of a ticker's info, fast_info and analyst data, cached on disk.
+
+    Args:
+        ticker: BIST stock symbol
+        ttl: Maximum cache age in seconds (defaults to config.TICKER_CACHE_TTL)
+
+    Returns:
+        Dictionary with "info", "fast_info", "analyst_price_targets" and
+        "recommendation" (first row of recommendations_summary) entries
+    """
+    ttl = config.TICKER_CACHE_TTL if ttl is None else ttl
+    snapshot = _file_cache.get(ticker, "info", ttl)
+    if snapshot is not None:
+        return snapshot
+
+    # info/fast_info failures propagate and are not cached
+    stock = get_ticker(ticker)
+    info = stock.info
+    fast_info = stock.fast_info
+
+    try:
+        targets = stock.analyst_price_targets
+        targets = dict(targets) if targets and hasattr(targets, "get") else None
+    except:
+        targets = None
+
+    try:
+        recommendations = stock.recommendations_summary
+        if recommendations is not None and len(recommendations) > 0 and hasattr(recommendations, "iloc"):
+            recommendation = recommendations.iloc[0].to_dict()
+        else:
+            recommendation = None
+    except:
+        recommendation = None
+
+    snapshot = {
+        "info": dict(info) if info else {},
+        # Missing fields are left out, so .get(field, default) applies the default
+        "fast_info": {
+            field: value for field in FAST_INFO_FIELDS
+            if (value := _safe_attr(fast_info, field)) is not None
+        },
+        "analyst_price_targets": targets,
+        "recommendation": recommendation,
+    }
+    # Round-trip through JSON so callers see the same types on hits and misses
+    snapshot = json.loads(json.dumps(snapshot, default=_json_default))
+    _file_cache.set(ticker, "info", snapshot)
+    return snapshot
@@ -1,13 +1,11 @@
 """Macroeconomic data tool using TCMB EVDS API."""
 from typing import Optional
+from functools import lru_cache
+import copy
 from pydantic import BaseModel, Field
 from langchain_core.tools import tool
 from datetime import datetime, timedelta
-import sys
-import os
 
-# Add parent directory to path for config import
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import config
 
 try:
@@ -58,12 +56,25 @@ def get_macro_data(indicators: str = "all") -> dict:
     """
     Fetch macroeconomic indicators from TCMB EVDS.
 
+    The snapshot is fetched at most once per day; each caller gets its
+    own copy, so it can be modified freely.
+
     Args:
         indicators: Which indicators to fetch
 
     Returns:
         Dictionary with macro data
     """
+    return copy.deepcopy(_macro_snapshot(indicators, _today()))
+
+
+def _today() -> str:
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+@lru_cache(maxsize=8)
+def _macro_snapshot(indicators: str, date_str: str) -> dict:
+    """Shared daily snapshot; the date only keys the cache. Do not modify."""
     # For reliability, use fallback data
     # EVDS API can be unreliable and requires specific setup
     return _get_fallback_macro_data()
@@ -85,46 +96,50 @@ def _get_fallback_macro_data() -> dict:
     }
 
 
-@tool(args_schema=MacroDataInput)
-def MacroDataTool(indicators: str = "all") -> str:
-    """
-    Fetch Turkish macroeconomic data from TCMB (Central Bank).
-    Returns policy interest rate, inflation (CPI/PPI), and exchange rates.
-    Use this tool for macro analysis and understanding market conditions.
-    """
-    data = get_macro_data(indicators)
-
-    result = f"""
+# Report layout: section title, then (indicator key, value/unit separator) lines
+_MACRO_HEADER = """
 ## Turkiye Makroekonomik Gostergeler
-Kaynak: {data.get('source', 'N/A')}
-Tarih: {data.get('fetch_date', 'N/A')}
-
-### Para Politikasi
+Kaynak: {source}
+Tarih: {fetch_date}
 """
-
+_MACRO_SECTIONS = (
+    ("Para Politikasi", (("policy_rate", ""),)),
+    ("Enflasyon", (("cpi_annual", ""), ("ppi_annual", ""))),
+    ("Doviz Kurlari", (("usd_try", " "), ("eur_try", " "))),
+)
+_MACRO_LINE = "- {name}: {value}{sep}{unit}\n"
+
+
+@lru_cache(maxsize=8)
+def _macro_report(indicators: str, date_str: str) -> str:
+    """Render the MacroDataTool report; cached per day like the snapshot it renders."""
+    data = _macro_snapshot(indicators, date_str)
     indicators_data = data.get("indicators", {})
 
-    if "policy_rate" in indicators_data:
-        pr = indicators_data["policy_rate"]
-        result += f"- {pr['name']}: {pr.get('value', 'N/A')}{pr.get('unit', '')}\n"
-
-    result += "\n### Enflasyon\n"
-    if "cpi_annual" in indicators_data:
-        cpi = indicators_data["cpi_annual"]
-        result += f"- {cpi['name']}: {cpi.get('value', 'N/A')}{cpi.get('unit', '')}\n"
-    if "ppi_annual" in indicators_data:
-        ppi = indicators_data["ppi_annual"]
-        result += f"- {ppi['name']}: {ppi.get('value', 'N/A')}{ppi.get('unit', '')}\n"
-
-    result += "\n### Doviz Kurlari\n"
-    if "usd_try" in indicators_data:
-        usd = indicators_data["usd_try"]
-        result += f"- {usd['name']}: {usd.get('value', 'N/A')} {usd.get('unit', '')}\n"
-    if "eur_try" in indicators_data:
-        eur = indicators_data["eur_try"]
-        result += f"- {eur['name']}: {eur.get('value', 'N/A')} {eur.get('unit', '')}\n"
+    parts = [_MACRO_HEADER.format(
+        source=data.get('source', 'N/A'),
+        fetch_date=data.get('fetch_date', 'N/A'),
+    )]
+    for title, keys in _MACRO_SECTIONS:
+        parts.append(f"\n### {title}\n")
+        for key, sep in keys:
+            if key in indicators_data:
+                ind = indicators_data[key]
+                parts.append(_MACRO_LINE.format(
+                    name=ind['name'], value=ind.get('value', 'N/A'), sep=sep, unit=ind.get('unit', '')
+                ))
 
     if data.get("note"):
-        result += f"\n* {data['note']}\n"
+        parts.append(f"\n* {data['note']}\n")
 
-    return result
+    return "".join(parts)
+
+
+@tool(args_schema=MacroDataInput)
+def MacroDataTool(indicators: str = "all") -> str:
+    """
+    Fetch Turkish macroeconomic data from TCMB (Central Bank).
+    Returns policy interest rate, inflation (CPI/PPI), and exchange rates.
+    Use this tool for macro analysis and understanding market conditions.
+    """
+    return _macro_report(indicators, _today())
@@ -3,6 +3,8 @@ from typing import Optional
 from pydantic import BaseModel, Field
 from langchain_core.tools import tool
 
+from src.utils.helpers import safe_format
+
 
 class StockDataInput(BaseModel):
     ticker: str = Field(description="BIST stock ticker symbol (e.g., THYAO, AKBNK)")
@@ -42,49 +44,26 @@ def get_stock_data(ticker: str, period: str = "3ay") -> dict:
         Dictionary with stock fundamentals and price data
     """
     try:
-        import borsapy as bp
-        stock = bp.Ticker(ticker.upper())
-
-        # Get fast info (uses attribute access, not dict)
-        fast_info = stock.fast_info
-
-        # Get detailed info (this is a dict)
-        info = stock.info
-
-        # Safe attribute access helper
-        def safe_attr(obj, attr, default=None):
-            try:
-                return getattr(obj, attr, default)
-            except:
-                return default
+        from .cache import cached_ticker_info
+        snapshot = cached_ticker_info(ticker.upper())
+        fast_info = snapshot["fast_info"]
+        info = snapshot["info"]
 
         # Get analyst data if available
-        try:
-            analyst_targets = stock.analyst_price_targets
-            target_price = analyst_targets.get("mean") if analyst_targets and hasattr(analyst_targets, 'get') else None
-        except:
-            target_price = None
-
-        try:
-            recommendations = stock.recommendations_summary
-            if recommendations is not None and len(recommendations) > 0:
-                rec_summary = recommendations.iloc[0].to_dict() if hasattr(recommendations, 'iloc') else None
-            else:
-                rec_summary = None
-        except:
-            rec_summary = None
-
-        # Extract fast_info using attribute access
-        current_price = safe_attr(fast_info, 'last_price')
-        previous_close = safe_attr(fast_info, 'previous_close')
-        volume = safe_attr(fast_info, 'volume')
-        market_cap = safe_attr(fast_info, 'market_cap')
-        pe_ratio = safe_attr(fast_info, 'pe_ratio')
-        pb_ratio = safe_attr(fast_info, 'pb_ratio')
-        free_float = safe_attr(fast_info, 'free_float')
-        foreign_ratio = safe_attr(fast_info, 'foreign_ratio')
-        year_high = safe_attr(fast_info, 'year_high')
-        year_low = safe_attr(fast_info, 'year_low')
+        analyst_targets = snapshot["analyst_price_targets"]
+        target_price = analyst_targets.get("mean") if analyst_targets else None
+        rec_summary = snapshot["recommendation"]
+
+        current_price = fast_info.get('last_price')
+        previous_close = fast_info.get('previous_close')
+        volume = fast_info.get('volume')
+        market_cap = fast_info.get('market_cap')
+        pe_ratio = fast_info.get('pe_ratio')
+        pb_ratio = fast_info.get('pb_ratio')
+        free_float = fast_info.get('free_float')
+        foreign_ratio = fast_info.get('foreign_ratio')
+        year_high = fast_info.get('year_high')
+        year_low = fast_info.get('year_low')
 
         # Calculate change percent
         change_percent = None
@@ -137,8 +116,8 @@ def StockDataTool(ticker: str, period: str = "3ay") -> str:
 ### Fiyat Bilgileri
 - Guncel Fiyat: {data.get('current_price', 'N/A')} TL
 - Onceki Kapanis: {data.get('previous_close', 'N/A')} TL
-- Degisim: {data.get('change_percent', 'N/A'):.2f}%
-- Hacim: {data.get('volume', 'N/A'):,}
+- Degisim: {safe_format(data.get('change_percent'), '.2f')}%
+- Hacim: {safe_format(data.get('volume'), ',')}
 
 ### Degerleme Carpanlari
 - F/K (P/E): {data.get('pe_ratio', 'N/A')}
@@ -146,7 +125,7 @@ def StockDataTool(ticker: str, period: str = "3ay") -> str:
 - Temettu Verimi: {data.get('dividend_yield', 'N/A')}
 
 ### Piyasa Bilgileri
-- Piyasa Degeri: {data.get('market_cap', 'N/A'):,.0f} TL
+- Piyasa Degeri: {safe_format(data.get('market_cap'), ',.0f')} TL
 - 52 Hafta En Yuksek: {data.get('week_52_high', 'N/A')} TL
 - 52 Hafta En Dusuk: {data.get('week_52_low', 'N/A')} TL
 - Halka Aciklik: {data.get('free_float', 'N/A')}%
@@ -1,12 +1,11 @@
 """Model portfolio lookup tool."""
 from typing import Optional, List
+from functools import lru_cache
+import copy
+import pandas as pd
 from pydantic import BaseModel, Field
 from langchain_core.tools import tool
-import sys
-import os
 
-# Add parent directory to path for config import
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import config
 
 
@@ -14,16 +13,46 @@ class ModelPortfoliosInput(BaseModel):
     ticker: Optional[str] = Field(default=None, description="Stock ticker to lookup, or None for all portfolios")
 
 
+@lru_cache(maxsize=1)
+def _portfolios_frame() -> pd.DataFrame:
+    """Flatten MODEL_PORTFOLIOS into one row per (institution, stock), indexed by ticker."""
+    rows = [
+        {
+            "broker": key,
+            "institution": portfolio["name"],
+            "ticker": stock["ticker"],
+            "rating": stock["rating"],
+            "target_price": stock["target_price"],
+            "weight": stock["current_weight"],
+            "last_updated": portfolio["last_updated"],
+        }
+        for key, portfolio in config.MODEL_PORTFOLIOS.items()
+        for stock in portfolio["stocks"]
+    ]
+    # Keep only the first listing of a ticker per institution
+    df = pd.DataFrame(rows).drop_duplicates(subset=["broker", "ticker"])
+    return df.set_index("ticker", drop=False)
+
+
 def get_model_portfolios(ticker: Optional[str] = None) -> dict:
     """
     Get model portfolio recommendations for a ticker.
 
+    Results are cached per ticker; each caller gets its own copy, so it
+    can be modified freely.
+
     Args:
         ticker: Stock symbol or None for overview
 
     Returns:
         Dictionary with model portfolio data
     """
+    return copy.deepcopy(_model_portfolios(ticker))
+
+
+@lru_cache(maxsize=len(config.TARGET_TICKERS) + 1)
+def _model_portfolios(ticker: Optional[str]) -> dict:
+    """Shared cached lookup behind get_model_portfolios. Do not modify."""
     portfolios = config.MODEL_PORTFOLIOS
 
     if ticker is None:
@@ -40,21 +69,9 @@ def get_model_portfolios(ticker: Optional[str] = None) -> dict:
 
     # Find ticker in all portfolios
     ticker = ticker.upper()
-    results = []
-
-    for key, portfolio in portfolios.items():
-        for stock in portfolio["stocks"]:
-            if stock["ticker"] == ticker:
-                results.append({
-                    "institution": portfolio["name"],
-                    "rating": stock["rating"],
-                    "target_price": stock["target_price"],
-                    "weight": stock["current_weight"],
-                    "last_updated": portfolio["last_updated"]
-                })
-                break
-
-    if not results:
+    df = _portfolios_frame()
+
+    if ticker not in df.index:
         return {
             "type": "ticker_search",
             "ticker": ticker,
@@ -62,11 +79,15 @@ def get_model_portfolios(ticker: Optional[str] = None) -> dict:
             "message": f"{ticker} model portfoylerde bulunamadi"
         }
 
-    # Calculate consensus
-    buy_count = sum(1 for r in results if r["rating"] == "AL")
-    hold_count = sum(1 for r in results if r["rating"] == "TUT")
-    sell_count = sum(1 for r in results if r["rating"] == "SAT")
-    avg_target = sum(r["target_price"] for r in results) / len(results)
+    matches = df.loc[[ticker]]
+    results = matches[["institution", "rating", "target_price", "weight", "last_updated"]].to_dict("records")
+
+    # Calculate consensus; one value_counts pass covers all three ratings
+    rating_counts = matches["rating"].value_counts()
+    buy_count = int(rating_counts.get("AL", 0))
+    hold_count = int(rating_counts.get("TUT", 0))
+    sell_count = int(rating_counts.get("SAT", 0))
+    avg_target = float(matches["target_price"].mean())
 
     return {
         "type": "ticker_search",
@@ -90,21 +111,24 @@ def ModelPortfoliosTool(ticker: Optional[str] = None) -> str:
     Shows which institutions recommend the stock and their target prices.
     Use this to understand institutional sentiment and consensus views.
     """
-    data = get_model_portfolios(ticker)
+    # Only read here, so the shared cached result is used without a copy
+    data = _model_portfolios(ticker)
 
     if data["type"] == "overview":
-        result = "## Model Portfoy Ozeti\n\n"
+        parts = ["## Model Portfoy Ozeti\n\n"]
         for p in data["portfolios"]:
-            result += f"### {p['institution']}\n"
-            result += f"- Hisse Sayisi: {p['stock_count']}\n"
-            result += f"- Son Guncelleme: {p['last_updated']}\n"
-            result += f"- One Cikanlar: {', '.join(p['top_picks'])}\n\n"
-        return result
+            parts.append(
+                f"### {p['institution']}\n"
+                f"- Hisse Sayisi: {p['stock_count']}\n"
+                f"- Son Guncelleme: {p['last_updated']}\n"
+                f"- One Cikanlar: {', '.join(p['top_picks'])}\n\n"
+            )
+        return "".join(parts)
 
     if not data.get("found"):
         return f"* {data['message']}"
 
-    result = f"""
+    parts = [f"""
 ## {data['ticker']} - Kurumsal Gorusler
 
 ### Konsensus
@@ -115,12 +139,14 @@ def ModelPortfoliosTool(ticker: Optional[str] = None) -> str:
 - Kapsama: {data['consensus']['coverage_count']} kurum
 
 ### Kurum Detaylari
-"""
+"""]
 
     for rec in data["recommendations"]:
-        result += f"\n**{rec['institution']}**\n"
-        result += f"- Tavsiye: {rec['rating']}\n"
-        result += f"- Hedef Fiyat: {rec['target_price']:.2f} TL\n"
-        result += f"- Portfoy Agirligi: {rec['weight']*100:.1f}%\n"
-
-    return result
+        parts.append(
+            f"\n**{rec['institution']}**\n"
+            f"- Tavsiye: {rec['rating']}\n"
+            f"- Hedef Fiyat: {rec['target_price']:.2f} TL\n"
+            f"- Portfoy Agirligi: {rec['weight']*100:.1f}%\n"
+        )
+
+    return "".join(parts)
@@ -1,12 +1,9 @@
 """RAG search tool for financial documents."""
-from typing import Optional, List
+from typing import Optional, List, Tuple
+from functools import lru_cache
 from pydantic import BaseModel, Field
 from langchain_core.tools import tool
-import sys
-import os
 
-# Add parent directory to path for config import
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import config
 
 # Will be initialized after vector store is set up
@@ -23,12 +20,45 @@ def init_rag_search(vector_store):
     """Initialize RAG search with vector store."""
     global _vector_store
     _vector_store = vector_store
+    # Cached results belong to the previous store
+    _search_cached.cache_clear()
+
+
+@lru_cache(maxsize=256)
+def _search_cached(query: str, ticker: Optional[str], top_k: int) -> tuple:
+    """
+    Search and format results; failures raise and are not cached.
+
+    Each result is stored as an immutable tuple of (key, value) items,
+    so the cached entry cannot be changed through a returned dict.
+    """
+    # Search
+    results = _vector_store.search(
+        query=query,
+        top_k=top_k,
+        filter=_vector_store.ticker_filter(ticker)
+    )
+
+    return tuple(
+        (
+            ("text", r.get("text", "")),
+            ("ticker", r.get("ticker", "N/A")),
+            ("document_type", r.get("document_type", "N/A")),
+            ("section", r.get("section", "N/A")),
+            ("score", r.get("score", 0)),
+            ("source", f"{r.get('ticker', 'N/A')} - {r.get('document_type', 'N/A')}"),
+        )
+        for r in results
+    )
 
 
 def search_documents(query: str, ticker: Optional[str] = None, top_k: int = 5) -> dict:
     """
     Search financial documents using RAG.
 
+    Results are cached per (query, ticker, top_k) until the vector store
+    is re-initialized; every call gets freshly built result dicts.
+
     Args:
         query: Search query
         ticker: Optional ticker filter
@@ -47,28 +77,10 @@ def search_documents(query: str, ticker: Optional[str] = None, top_k: int = 5) -
         }
 
     try:
-        # Build filter
-        filter_condition = None
-        if ticker:
-            filter_condition = f"ticker = '{ticker.upper()}'"
-
-        # Search
-        results = _vector_store.search(
-            query=query,
-            top_k=top_k,
-            filter=filter_condition
-        )
-
-        formatted_results = []
-        for r in results:
-            formatted_results.append({
-                "text": r.get("text", ""),
-                "ticker": r.get("ticker", "N/A"),
-                "document_type": r.get("document_type", "N/A"),
-                "section": r.get("section", "N/A"),
-                "score": r.get("score", 0),
-                "source": f"{r.get('ticker', 'N/A')} - {r.get('document_type', 'N/A')}"
-            })
+        # Repeated searches within a session are served from memory
+        formatted_results = [
+            dict(r) for r in _search_cached(query, ticker.upper() if ticker else None, top_k)
+        ]
 
         return {
             "query": query,
@@ -84,6 +96,27 @@ def search_documents(query: str, ticker: Optional[str] = None, top_k: int = 5) -
         }
 
 
+def search_documents_many(queries: List[Tuple[str, Optional[str], int]]) -> List[dict]:
+    """
+    Run several document searches, embedding all their queries in one request.
+
+    Args:
+        queries: (query, ticker, top_k) tuples
+
+    Returns:
+        One search_documents result per query, in order
+    """
+    if _vector_store is not None and len(queries) > 1:
+        from src.rag.embeddings import prefetch_query_embeddings
+        try:
+            # Each search below then reads its embedding from the cache
+            prefetch_query_embeddings(list(dict.fromkeys(q for q, _, _ in queries)))
+        except Exception as e:
+            print(f"Query embedding prefetch error: {e}")
+
+    return [search_documents(query, ticker, top_k) for query, ticker, top_k in queries]
+
+
 @tool(args_schema=RAGSearchInput)
 def RAGSearchTool(query: str, ticker: Optional[str] = None, top_k: int = 5) -> str:
     """
@@ -99,12 +132,16 @@ def RAGSearchTool(query: str, ticker: Optional[str] = None, top_k: int = 5) -> s
     if not data["results"]:
         return f"'{query}' icin sonuc bulunamadi."
 
-    result = f"## Dokuman Aramasi: '{query}'\n\n"
-    result += f"Bulunan: {data['total_found']} sonuc\n\n"
+    parts = [
+        f"## Dokuman Aramasi: '{query}'\n\n",
+        f"Bulunan: {data['total_found']} sonuc\n\n",
+    ]
 
     for i, r in enumerate(data["results"], 1):
-        result += f"### Sonuc {i} ({r['source']})\n"
-        result += f"Bolum: {r['section']}\n"
-        result += f"```\n{r['text'][:500]}{'...' if len(r['text']) > 500 else ''}\n```\n\n"
+        parts.append(
+            f"### Sonuc {i} ({r['source']})\n"
+            f"Bolum: {r['section']}\n"
+            f"```\n{r['text'][:500]}{'...' if len(r['text']) > 500 else ''}\n```\n\n"
+        )
 
-    return result
+    return "".join(parts)
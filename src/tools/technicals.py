@@ -1,44 +1,118 @@
 """Technical analysis tool."""
 from typing import Optional
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+import time
 from pydantic import BaseModel, Field
 from langchain_core.tools import tool
-import pandas as pd
 import numpy as np
 
+import config
+from src.utils.helpers import safe_format
+
+# Concurrent history downloads in calculate_technicals_batch
+FETCH_WORKERS = 8
+
 
 class TechnicalsInput(BaseModel):
     ticker: str = Field(description="BIST stock ticker symbol")
     period: str = Field(default="6ay", description="Analysis period: 1ay, 3ay, 6ay, 1y")
 
 
-def calculate_rsi(prices: pd.Series, period: int = 14) -> float:
-    """Calculate RSI indicator."""
-    delta = prices.diff()
-    gain = delta.where(delta > 0, 0).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi.iloc[-1] if len(rsi) > 0 else None
+# Trend by _cmp(price, sma_20); the two strong trends also need _cmp(sma_20, sma_50)
+_TREND = {1: "Yukselis", 0: "Yatay", -1: "Dusus"}
+_STRONG_TREND = {(1, 1): "Guclu Yukselis", (-1, -1): "Guclu Dusus"}
+
+
+def _cmp(a, b) -> int:
+    """1, -1 or 0 as a > b, a < b or neither (equal or NaN)."""
+    return int(a > b) - int(a < b)
+
+
+def calculate_rsi(prices: np.ndarray, period: int = 14) -> float:
+    """
+    Calculate RSI indicator (simple-average gains and losses over the last period).
+
+    Only the latest value is needed, so it is computed from the last
+    `period` price changes instead of full rolling series.
+    """
+    arr = np.asarray(prices, dtype=np.float64)
+    if arr.size == 0:
+        return None
+    if arr.size < period:
+        return np.nan
+
+    # The first price has no change and counts as 0 in a full window;
+    # NaN changes count as 0 as well
+    delta = np.diff(arr[-(period + 1):])
+    avg_gain = np.where(delta > 0, delta, 0.0).sum() / period
+    avg_loss = np.where(delta < 0, -delta, 0.0).sum() / period
+
+    if avg_loss == 0:
+        return 100.0 if avg_gain > 0 else np.nan
+    return 100 - (100 / (1 + avg_gain / avg_loss))
+
 
+def calculate_macd(prices: np.ndarray) -> dict:
+    """
+    Calculate MACD indicator.
+
+    The 12/26-span EMAs and the 9-span signal EMA (same recursion as
+    ewm(adjust=False)) are advanced together in one pass over the closes.
+    """
+    a12, a26, a9 = 2 / 13, 2 / 27, 2 / 10
+    values = [x for x in np.asarray(prices, dtype=np.float64).tolist() if x == x]  # Drop NaN closes
+    if not values:
+        return {"macd": np.nan, "signal": np.nan, "histogram": np.nan}
+
+    ema12 = ema26 = values[0]
+    macd = signal = 0.0  # EMAs start equal, so the first MACD value is 0
+    for x in values[1:]:
+        ema12 += a12 * (x - ema12)
+        ema26 += a26 * (x - ema26)
+        macd = ema12 - ema26
+        signal += a9 * (macd - signal)
 
-def calculate_macd(prices: pd.Series) -> dict:
-    """Calculate MACD indicator."""
-    exp1 = prices.ewm(span=12, adjust=False).mean()
-    exp2 = prices.ewm(span=26, adjust=False).mean()
-    macd = exp1 - exp2
-    signal = macd.ewm(span=9, adjust=False).mean()
-    histogram = macd - signal
     return {
-        "macd": macd.iloc[-1],
-        "signal": signal.iloc[-1],
-        "histogram": histogram.iloc[-1]
+        "macd": macd,
+        "signal": signal,
+        "histogram": macd - signal
     }
 
 
+def calculate_technicals_batch(tickers, period: str = "6ay") -> dict:
+    """
+    Calculate technical indicators for several stocks concurrently.
+
+    History downloads are blocking HTTP calls, so each ticker runs on its
+    own thread; results share calculate_technicals' cache.
+
+    Args:
+        tickers: Stock symbols
+        period: Analysis period
+
+    Returns:
+        Dictionary of calculate_technicals results keyed by upper-cased ticker
+    """
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))
+    if not tickers:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(tickers))) as executor:
+        return dict(zip(tickers, executor.map(calculate_technicals, tickers, [period] * len(tickers))))
+
+
+class _TechnicalsFailed(Exception):
+    """Carries an error result out of the cache so it is not stored."""
+
+
 def calculate_technicals(ticker: str, period: str = "6ay") -> dict:
     """
     Calculate technical indicators for a BIST stock.
 
+    Results are kept in memory for config.TECHNICALS_CACHE_TTL seconds,
+    so repeated questions about a ticker skip the history download
+    (a TTL of 0 or less disables the cache).
+
     Args:
         ticker: Stock symbol
         period: Analysis period
@@ -46,9 +120,32 @@ def calculate_technicals(ticker: str, period: str = "6ay") -> dict:
     Returns:
         Dictionary with technical indicators
     """
+    ttl = config.TECHNICALS_CACHE_TTL
+    if ttl <= 0:
+        return _compute_technicals(ticker.upper(), period)
+
+    # Entries expire when the time bucket rolls over
+    bucket = int(time.time() // ttl)
     try:
-        import borsapy as bp
-        stock = bp.Ticker(ticker.upper())
+        return dict(_cached_technicals(ticker.upper(), period, bucket))
+    except _TechnicalsFailed as e:
+        return e.args[0]
+
+
+@lru_cache(maxsize=128)
+def _cached_technicals(ticker: str, period: str, bucket: int) -> dict:
+    """Successful results only; failures raise and are not cached."""
+    data = _compute_technicals(ticker, period)
+    if data.get("error"):
+        raise _TechnicalsFailed(data)
+    return data
+
+
+def _compute_technicals(ticker: str, period: str) -> dict:
+    """Download history and compute the indicators (uncached)."""
+    try:
+        from .cache import get_ticker
+        stock = get_ticker(ticker)
         df = stock.history(period=period)
 
         # Accept smaller datasets (at least 10 rows)
@@ -58,48 +155,48 @@ def calculate_technicals(ticker: str, period: str = "6ay") -> dict:
         close = df['Close']
         data_len = len(close)
 
+        # Only the latest value of each window statistic is reported, so
+        # they are reduced over tail slices instead of full rolling series
+        # (NaN in a window yields NaN, as with rolling)
+        c = np.ascontiguousarray(close.to_numpy(dtype=np.float64))
+
         # Moving Averages - adjusted for available data
         sma_window = min(20, data_len - 1)
-        sma_20 = close.rolling(window=sma_window).mean().iloc[-1] if sma_window > 0 else close.iloc[-1]
-        sma_50 = close.rolling(window=50).mean().iloc[-1] if data_len >= 50 else None
-        sma_200 = close.rolling(window=200).mean().iloc[-1] if data_len >= 200 else None
+        sma_20 = c[-sma_window:].mean() if sma_window > 0 else c[-1]
+        sma_50 = c[-50:].mean() if data_len >= 50 else None
+        sma_200 = c[-200:].mean() if data_len >= 200 else None
 
         # RSI - adjusted for available data
         rsi_period = min(14, data_len - 1)
-        rsi = calculate_rsi(close, period=rsi_period) if rsi_period >= 2 else None
+        rsi = calculate_rsi(c, period=rsi_period) if rsi_period >= 2 else None
 
         # MACD - need at least 26 periods for proper calculation
         if data_len >= 26:
-            macd_data = calculate_macd(close)
+            macd_data = calculate_macd(c)
         else:
             macd_data = {"macd": 0, "signal": 0, "histogram": 0}
 
         # Bollinger Bands - adjusted for available data
         bb_window = min(20, data_len - 1)
         if bb_window > 1:
-            sma_20_bb = close.rolling(window=bb_window).mean()
-            std_20 = close.rolling(window=bb_window).std()
-            upper_band = (sma_20_bb + (std_20 * 2)).iloc[-1]
-            lower_band = (sma_20_bb - (std_20 * 2)).iloc[-1]
+            bb_tail = c[-bb_window:]
+            sma_20_bb = bb_tail.mean()
+            std_20 = bb_tail.std(ddof=1)  # Sample std, as rolling().std()
+            upper_band = sma_20_bb + (std_20 * 2)
+            lower_band = sma_20_bb - (std_20 * 2)
         else:
-            upper_band = close.iloc[-1]
-            lower_band = close.iloc[-1]
+            upper_band = c[-1]
+            lower_band = c[-1]
 
         # Current price position
-        current_price = close.iloc[-1]
+        current_price = c[-1]
 
         # Trend determination
         if sma_50:
-            if current_price > sma_20 > sma_50:
-                trend = "Guclu Yukselis"
-            elif current_price > sma_20:
-                trend = "Yukselis"
-            elif current_price < sma_20 < sma_50:
-                trend = "Guclu Dusus"
-            elif current_price < sma_20:
-                trend = "Dusus"
-            else:
-                trend = "Yatay"
+            price_vs_sma = _cmp(current_price, sma_20)
+            trend = _STRONG_TREND.get(
+                (price_vs_sma, _cmp(sma_20, sma_50)), _TREND[price_vs_sma]
+            )
         else:
             trend = "Yukselis" if current_price > sma_20 else "Dusus"
 
@@ -116,14 +213,15 @@ def calculate_technicals(ticker: str, period: str = "6ay") -> dict:
 
         # Support/Resistance (simple: recent low/high)
         sr_window = min(20, data_len)
-        support = close.rolling(window=sr_window).min().iloc[-1]
-        resistance = close.rolling(window=sr_window).max().iloc[-1]
+        support = c[-sr_window:].min()
+        resistance = c[-sr_window:].max()
 
         # Volume trend
         if 'Volume' in df.columns:
             vol_window = min(20, data_len)
-            vol_sma = df['Volume'].rolling(window=vol_window).mean().iloc[-1]
-            current_vol = df['Volume'].iloc[-1]
+            volume = df['Volume'].to_numpy(dtype=np.float64)
+            vol_sma = volume[-vol_window:].mean()
+            current_vol = volume[-1]
             volume_trend = "Artan" if current_vol > vol_sma else "Azalan"
         else:
             volume_trend = "N/A"
@@ -152,6 +250,50 @@ def calculate_technicals(ticker: str, period: str = "6ay") -> dict:
         return {"ticker": ticker, "error": f"Technical analysis failed: {str(e)}"}
 
 
+_TECHNICALS_REPORT = """
+## {ticker} Teknik Analiz
+
+### Fiyat ve Trend
+- Guncel Fiyat: {current_price} TL
+- Trend: **{trend}**
+- Hacim Trendi: {volume_trend}
+
+### Hareketli Ortalamalar
+- SMA 20: {sma_20} TL
+- SMA 50: {sma_50} TL
+- SMA 200: {sma_200} TL
+
+### Momentum Gostergeleri
+- RSI (14): {rsi_14} - **{rsi_signal}**
+- MACD: {macd}
+- MACD Sinyal: {macd_signal}
+- MACD Histogram: {macd_histogram}
+
+### Bollinger Bantlari
+- Ust Bant: {bollinger_upper} TL
+- Alt Bant: {bollinger_lower} TL
+
+### Destek / Direnc
+- Destek: {support} TL
+- Direnc: {resistance} TL
+"""
+# Number format per report field; other fields are inserted as-is
+_REPORT_SPECS = {
+    "current_price": ".2f",
+    "sma_20": ".2f",
+    "sma_50": ".2f",
+    "sma_200": ".2f",
+    "rsi_14": ".1f",
+    "macd": ".3f",
+    "macd_signal": ".3f",
+    "macd_histogram": ".3f",
+    "bollinger_upper": ".2f",
+    "bollinger_lower": ".2f",
+    "support": ".2f",
+    "resistance": ".2f",
+}
+
+
 @tool(args_schema=TechnicalsInput)
 def TechnicalsTool(ticker: str, period: str = "6ay") -> str:
     """
@@ -164,31 +306,7 @@ def TechnicalsTool(ticker: str, period: str = "6ay") -> str:
     if data.get("error"):
         return f"Error: {data['error']}"
 
-    result = f"""
-## {data['ticker']} Teknik Analiz
-
-### Fiyat ve Trend
-- Guncel Fiyat: {data['current_price']:.2f} TL
-- Trend: **{data['trend']}**
-- Hacim Trendi: {data['volume_trend']}
-
-### Hareketli Ortalamalar
-- SMA 20: {data['sma_20']:.2f} TL
-- SMA 50: {data['sma_50']:.2f if data['sma_50'] else 'N/A'} TL
-- SMA 200: {data['sma_200']:.2f if data['sma_200'] else 'N/A'} TL
-
-### Momentum Gostergeleri
-- RSI (14): {data['rsi_14']:.1f} - **{data['rsi_signal']}**
-- MACD: {data['macd']:.3f}
-- MACD Sinyal: {data['macd_signal']:.3f}
-- MACD Histogram: {data['macd_histogram']:.3f}
-
-### Bollinger Bantlari
-- Ust Bant: {data['bollinger_upper']:.2f} TL
-- Alt Bant: {data['bollinger_lower']:.2f} TL
-
-### Destek / Direnc
-- Destek: {data['support']:.2f} TL
-- Direnc: {data['resistance']:.2f} TL
-"""
-    return result
+    # Missing indicators (e.g. RSI on very short histories) render as N/A
+    fields = dict(data)
+    fields.update((key, safe_format(data.get(key), spec)) for key, spec in _REPORT_SPECS.items())
+    return _TECHNICALS_REPORT.format_map(fields)
@@ -1,5 +1,6 @@
 """Utility helper functions."""
 from typing import Dict, Any
+from numbers import Real
 
 
 def format_dict(d: dict, indent: int = 0) -> str:
@@ -8,14 +9,24 @@ def format_dict(d: dict, indent: int = 0) -> str:
         return "None"
 
     lines = []
-    prefix = "  " * indent
+    # One items() iterator per open level, so nesting never recurses
+    stack = [(iter(d.items()), indent)]
 
-    for key, value in d.items():
+    while stack:
+        items, level = stack[-1]
+        entry = next(items, None)
+        if entry is None:
+            stack.pop()
+            continue
+
+        key, value = entry
+        prefix = "  " * level
         if isinstance(value, dict):
             lines.append(f"{prefix}{key}:")
-            lines.append(format_dict(value, indent + 1))
-        elif isinstance(value, list):
-            lines.append(f"{prefix}{key}: {value}")
+            if value:
+                stack.append((iter(value.items()), level + 1))
+            else:
+                lines.append("")
         else:
             lines.append(f"{prefix}{key}: {value}")
 
@@ -24,6 +35,11 @@ def format_dict(d: dict, indent: int = 0) -> str:
 
 def safe_float(value: Any, default: float = 0.0) -> float:
     """Safely convert value to float."""
+    # Already-numeric values skip the try block
+    if type(value) is float:
+        return value
+    if type(value) is int:
+        return float(value)
     try:
         if value is None:
             return default
@@ -34,9 +50,19 @@ def safe_float(value: Any, default: float = 0.0) -> float:
 
 def safe_int(value: Any, default: int = 0) -> int:
     """Safely convert value to int."""
+    # Already-integral values skip the try block
+    if type(value) is int:
+        return value
     try:
         if value is None:
             return default
         return int(value)
     except (ValueError, TypeError):
         return default
+
+
+def safe_format(value: Any, spec: str = "", default: str = "N/A") -> str:
+    """Format a number with spec, or return default for missing/non-numeric values."""
+    if isinstance(value, Real):
+        return format(value, spec)
+    return default
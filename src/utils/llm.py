@@ -0,0 +1,15 @@
+"""Shared Gemini chat clients."""
+from functools import lru_cache
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+import config
+
+
+@lru_cache(maxsize=8)
+def get_llm(model: str = config.GEMINI_MODEL, temperature: float = config.TEMPERATURE) -> ChatGoogleGenerativeAI:
+    """Return a shared chat client per (model, temperature); safe to use across threads."""
+    return ChatGoogleGenerativeAI(
+        model=model,
+        google_api_key=config.GEMINI_API_KEY,
+        temperature=temperature
+    )
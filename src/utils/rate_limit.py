@@ -0,0 +1,43 @@
+"""Client-side rate limiting for Gemini API calls."""
+import threading
+import time
+
+import config
+
+
+class RateLimiter:
+    """Thread-safe token bucket allowing `rate` calls per `period` seconds."""
+
+    def __init__(self, rate: int, period: float = 60.0):
+        self.capacity = max(1, rate)
+        self.refill_per_second = self.capacity / period
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a call slot is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                elapsed = now - self.updated
+                self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.refill_per_second
+
+            time.sleep(wait)
+
+
+# Shared by every Gemini caller (agent, RAG embeddings, evaluation)
+gemini_limiter = RateLimiter(config.GEMINI_RPM, 60)
+
+
+def gemini_call(fn, *args, **kwargs):
+    """Call a Gemini client function once a rate-limit slot is free."""
+    gemini_limiter.acquire()
+    return fn(*args, **kwargs)